@@ -5,8 +5,6 @@ EDA组件系统完整演示
 """
 
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), "zlayout"))
 
 from zlayout.component_db import ComponentDatabase, ComponentSpec
 from zlayout.logic_circuits import FlipFlop, Counter, ProcessorFSM, LogicState
@@ -188,9 +186,15 @@ def create_mixed_signal_system(db: ComponentDatabase):
         "clock_divider": clock_divider
     }
 
-def simulate_system_operation(system_components):
+def _emit(lines):
+    """一次性输出缓冲的行并清空缓冲区"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+def simulate_system_operation(system_components, verbose=False):
     """模拟系统操作"""
-    print("\n=== 系统操作模拟 ===")
+    out = ["\n=== 系统操作模拟 ==="]
     
     adc_fsm = system_components["adc_fsm"]
     data_buffer = system_components["data_buffer"]
@@ -202,48 +206,52 @@ def simulate_system_operation(system_components):
     control_ff.enable_signal.set_state(LogicState.HIGH)
     clock_divider.enable_signal.set_state(LogicState.HIGH)
     
-    print("--- 时钟分频器操作 ---")
-    for i in range(5):
-        clock_divider.on_clock_edge()
-        count = clock_divider.internal_state["count"]
-        print(f"时钟周期 {i+1}: 分频计数 = {count}")
-    
-    print("\n--- ADC控制状态机操作 ---")
-    # 模拟ADC转换过程
-    adc_fsm.input_signals["start_conversion"].set_state(LogicState.HIGH)
-    adc_fsm.process_inputs()
-    
-    adc_fsm.input_signals["sample_complete"].set_state(LogicState.HIGH)
-    adc_fsm.process_inputs()
-    
-    adc_fsm.input_signals["hold_complete"].set_state(LogicState.HIGH)
-    adc_fsm.process_inputs()
-    
-    adc_fsm.input_signals["conversion_complete"].set_state(LogicState.HIGH)
-    adc_fsm.process_inputs()
-    
-    adc_fsm.input_signals["data_read"].set_state(LogicState.HIGH)
-    adc_fsm.process_inputs()
-    
-    print("\n--- 数据缓冲区操作 ---")
-    for i in range(3):
-        data_buffer.on_clock_edge()
-        count = data_buffer.internal_state["count"]
-        print(f"数据采样 {i+1}: 缓冲区值 = {count}")
-    
-    print("\n--- 控制逻辑操作 ---")
+    out.append("--- 时钟分频器操作 ---")
+    if verbose:
+        for i in range(5):
+            clock_divider.on_clock_edge()
+            out.append(f"时钟周期 {i+1}: 分频计数 = {clock_divider.internal_state['count']}")
+    else:
+        clock_divider.advance(5)
+    out.append(f"5个时钟周期后: 分频计数 = {clock_divider.internal_state['count']}")
+    
+    out.append("\n--- ADC控制状态机操作 ---")
+    # 模拟ADC转换过程: 一次性执行整个事件序列
+    start_state = adc_fsm.current_state
+    path = adc_fsm.run_sequence([
+        "start_conversion",
+        "sample_complete",
+        "hold_complete",
+        "conversion_complete",
+        "data_read",
+    ])
+    out.append("状态序列: " + " -> ".join(
+        [start_state] + [adc_fsm.state_names[state] for state in path]
+    ))
+    
+    out.append("\n--- 数据缓冲区操作 ---")
+    if verbose:
+        for i in range(3):
+            data_buffer.on_clock_edge()
+            out.append(f"数据采样 {i+1}: 缓冲区值 = {data_buffer.internal_state['count']}")
+    else:
+        data_buffer.advance(3)
+    out.append(f"3次数据采样后: 缓冲区值 = {data_buffer.internal_state['count']}")
+    
+    out.append("\n--- 控制逻辑操作 ---")
     control_ff.inputs["J"].set_state(LogicState.HIGH)
     control_ff.inputs["K"].set_state(LogicState.LOW)
     control_ff.on_clock_edge()
-    print(f"JK触发器状态: Q = {control_ff.outputs['Q'].state}")
+    out.append(f"JK触发器状态: Q = {control_ff.outputs['Q'].state}")
+    _emit(out)
 
 def analyze_system_complexity(db: ComponentDatabase, system_components):
     """分析系统复杂度"""
-    print("\n=== 系统复杂度分析 ===")
+    out = ["\n=== 系统复杂度分析 ==="]
     
     # 统计数据库中的组件
-    library = db.get_component_library()
-    total_db_components = sum(library.values())
+    library_items = list(db.get_component_library().items())
+    total_db_components = sum(count for _, count in library_items)
     
     # 统计类定义的组件
     logic_components = [
@@ -253,52 +261,57 @@ def analyze_system_complexity(db: ComponentDatabase, system_components):
         "时钟分频器"
     ]
     
-    print(f"数据库存储组件: {total_db_components} 个")
-    for category, count in library.items():
-        print(f"  - {category}: {count} 个")
+    out.append(f"数据库存储组件: {total_db_components} 个")
+    out.extend(f"  - {category}: {count} 个" for category, count in library_items)
     
-    print(f"\n类定义的逻辑组件: {len(logic_components)} 个")
-    for comp in logic_components:
-        print(f"  - {comp}")
+    out.append(f"\n类定义的逻辑组件: {len(logic_components)} 个")
+    out.extend(f"  - {comp}" for comp in logic_components)
     
-    print(f"\n总组件数: {total_db_components + len(logic_components)}")
+    out.append(f"\n总组件数: {total_db_components + len(logic_components)}")
     
     # 分析优势
-    print("\n--- 架构优势分析 ---")
-    print("✓ 数据库存储:")
-    print("  - 灵活的参数定义")
-    print("  - 支持用户自定义组件")
-    print("  - 支持中间模块")
-    print("  - 易于搜索和管理")
-    
-    print("\n✓ 类定义:")
-    print("  - 复杂的时序逻辑建模")
-    print("  - 状态机行为仿真")
-    print("  - 实时信号处理")
-    print("  - 时序约束检查")
-    
-    print("\n✓ 混合架构:")
-    print("  - 避免了过度的类继承")
-    print("  - 提供了最大的灵活性")
-    print("  - 适合EDA工具的实际需求")
-    print("  - 支持十亿级组件设计")
+    out.extend([
+        "\n--- 架构优势分析 ---",
+        "✓ 数据库存储:",
+        "  - 灵活的参数定义",
+        "  - 支持用户自定义组件",
+        "  - 支持中间模块",
+        "  - 易于搜索和管理",
+        "\n✓ 类定义:",
+        "  - 复杂的时序逻辑建模",
+        "  - 状态机行为仿真",
+        "  - 实时信号处理",
+        "  - 时序约束检查",
+        "\n✓ 混合架构:",
+        "  - 避免了过度的类继承",
+        "  - 提供了最大的灵活性",
+        "  - 适合EDA工具的实际需求",
+        "  - 支持十亿级组件设计",
+    ])
+    _emit(out)
 
-def main():
-    """主函数"""
+def run_demo(db_path: str = ":memory:", verbose: bool = False):
+    """运行完整演示
+    
+    默认使用内存数据库，便于基准测试反复调用而不产生磁盘I/O。
+    """
     print("=== EDA组件系统完整演示 ===")
     print("展示数据库存储 + 类定义的混合架构")
     
     # 创建数据库
-    db = ComponentDatabase("mixed_signal_system.db")
-    
-    # 创建混合信号系统
-    system_components = create_mixed_signal_system(db)
-    
-    # 模拟系统操作
-    simulate_system_operation(system_components)
-    
-    # 分析系统复杂度
-    analyze_system_complexity(db, system_components)
+    db = ComponentDatabase(db_path)
+    
+    try:
+        # 创建混合信号系统
+        system_components = create_mixed_signal_system(db)
+        
+        # 模拟系统操作
+        simulate_system_operation(system_components, verbose=verbose)
+        
+        # 分析系统复杂度
+        analyze_system_complexity(db, system_components)
+    finally:
+        db.close()
     
     print("\n=== 演示完成 ===")
     print("✓ 成功展示了混合架构的优势")
@@ -306,7 +319,12 @@ def main():
     print("✓ 类定义支持了复杂逻辑建模")
     print("✓ 这种架构更适合实际EDA工具开发")
     
-    db.close()
+    return system_components
+
+def main():
+    """主函数"""
+    # --verbose 输出每个时钟周期的状态
+    run_demo("mixed_signal_system.db", verbose="--verbose" in sys.argv)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
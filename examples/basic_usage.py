@@ -15,8 +15,9 @@ import os
 # Add parent directory to path to import zlayout
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+import numpy as np
+
 import zlayout
-import matplotlib.pyplot as plt
 
 
 def create_sample_layout():
@@ -36,47 +37,44 @@ def create_sample_layout():
         zlayout.Rectangle(75, 40, 8, 15),   # Component 4
     ]
     
-    for rect in rectangles:
-        processor.add_component(rect)
-    
     # Add some polygonal components (representing custom shapes)
     polygons = [
         # Triangle with sharp angle
-        zlayout.Polygon([
-            zlayout.Point(20, 50),
-            zlayout.Point(35, 55),
-            zlayout.Point(22, 65)
-        ]),
+        zlayout.Polygon(np.array([
+            [20, 50],
+            [35, 55],
+            [22, 65]
+        ], dtype=np.float64)),
         
         # L-shaped component
-        zlayout.Polygon([
-            zlayout.Point(45, 60),
-            zlayout.Point(60, 60),
-            zlayout.Point(60, 70),
-            zlayout.Point(55, 70),
-            zlayout.Point(55, 75),
-            zlayout.Point(45, 75)
-        ]),
+        zlayout.Polygon(np.array([
+            [45, 60],
+            [60, 60],
+            [60, 70],
+            [55, 70],
+            [55, 75],
+            [45, 75]
+        ], dtype=np.float64)),
         
         # Narrow component that might cause spacing issues
-        zlayout.Polygon([
-            zlayout.Point(70, 10),
-            zlayout.Point(90, 12),
-            zlayout.Point(88, 18),
-            zlayout.Point(68, 16)
-        ]),
+        zlayout.Polygon(np.array([
+            [70, 10],
+            [90, 12],
+            [88, 18],
+            [68, 16]
+        ], dtype=np.float64)),
         
         # Component with potential intersection
-        zlayout.Polygon([
-            zlayout.Point(25, 20),
-            zlayout.Point(40, 25),
-            zlayout.Point(35, 35),
-            zlayout.Point(20, 30)
-        ])
+        zlayout.Polygon(np.array([
+            [25, 20],
+            [40, 25],
+            [35, 35],
+            [20, 30]
+        ], dtype=np.float64))
     ]
     
-    for polygon in polygons:
-        processor.add_component(polygon)
+    # Build the spatial index from all components in one batch
+    processor.add_components(rectangles + polygons)
     
     return processor, rectangles, polygons
 
@@ -92,37 +90,45 @@ def demonstrate_analysis(processor):
     
     analysis = optimization_results['analysis']
     
-    # Print results
-    print(f"Optimization Score: {optimization_results['optimization_score']:.1f}/100\n")
+    # Collect the report and write it in one go
+    lines = [f"Optimization Score: {optimization_results['optimization_score']:.1f}/100\n"]
     
-    print("Sharp Angles Analysis:")
-    print(f"  - Found {analysis['sharp_angles']['count']} sharp angles")
+    lines.append("Sharp Angles Analysis:")
+    lines.append(f"  - Found {analysis['sharp_angles']['count']} sharp angles")
     if analysis['sharp_angles']['count'] > 0:
-        print(f"  - Sharpest angle: {analysis['sharp_angles']['sharpest']:.1f}°")
-        print(f"  - Average angle: {analysis['sharp_angles']['average']:.1f}°")
-    print()
+        lines.append(f"  - Sharpest angle: {analysis['sharp_angles']['sharpest']:.1f}°")
+        lines.append(f"  - Average angle: {analysis['sharp_angles']['average']:.1f}°")
+    lines.append("")
     
-    print("Narrow Distances Analysis:")
-    print(f"  - Found {analysis['narrow_distances']['count']} narrow regions")
+    lines.append("Narrow Distances Analysis:")
+    lines.append(f"  - Found {analysis['narrow_distances']['count']} narrow regions")
     if analysis['narrow_distances']['count'] > 0:
-        print(f"  - Minimum distance: {analysis['narrow_distances']['minimum']:.3f}")
-        print(f"  - Average distance: {analysis['narrow_distances']['average']:.3f}")
-    print()
+        lines.append(f"  - Minimum distance: {analysis['narrow_distances']['minimum']:.3f}")
+        lines.append(f"  - Average distance: {analysis['narrow_distances']['average']:.3f}")
+    lines.append("")
+    
+    lines.append("Edge Intersections Analysis:")
+    lines.append(f"  - Found {analysis['intersections']['polygon_pairs']} intersecting polygon pairs")
+    lines.append(f"  - Total intersection points: {analysis['intersections']['total_points']}")
+    lines.append("")
     
-    print("Edge Intersections Analysis:")
-    print(f"  - Found {analysis['intersections']['polygon_pairs']} intersecting polygon pairs")
-    print(f"  - Total intersection points: {analysis['intersections']['total_points']}")
-    print()
+    lines.append("Suggestions:")
+    lines.extend(f"  • {suggestion}" for suggestion in optimization_results['suggestions'])
     
-    print("Suggestions:")
-    for suggestion in optimization_results['suggestions']:
-        print(f"  • {suggestion}")
+    print("\n".join(lines))
     
     return optimization_results
 
 
 def demonstrate_visualization(processor, rectangles, polygons, optimization_results):
-    """Demonstrate visualization capabilities."""
+    """Demonstrate visualization capabilities.
+    
+    Returns an empty list without importing matplotlib when ZLAYOUT_NOVIZ is set.
+    """
+    if os.environ.get('ZLAYOUT_NOVIZ'):
+        return []
+    
+    import matplotlib.pyplot as plt
     
     print("\n=== Generating Visualizations ===")
     
@@ -203,6 +209,11 @@ def main():
     demonstrate_quadtree()
     
     # Demonstrate visualization
+    if os.environ.get('ZLAYOUT_NOVIZ'):
+        print("\nZLAYOUT_NOVIZ is set. Skipping visualization demo.")
+        print("\nDemo completed!")
+        return
+    
     try:
         figures = demonstrate_visualization(processor, rectangles, polygons, optimization_results)
         
@@ -11,17 +11,24 @@ This example simulates a more realistic electronic circuit layout with:
 import sys
 import os
 import math
+import bisect
+from collections import Counter
+from typing import List
+
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 import zlayout
-import matplotlib.pyplot as plt
+from zlayout._kernels import rotated_rect, trace_quad
 
 
 class CircuitComponent:
     """Represents a circuit component with properties."""
     
+    __slots__ = ('name', 'geometry', 'component_type', 'pins')
+    
     def __init__(self, name: str, geometry, component_type: str = "generic"):
         self.name = name
         self.geometry = geometry
@@ -33,6 +40,89 @@ class CircuitComponent:
         self.pins.append((point, pin_name))
 
 
+class ComponentTable:
+    """Structure-of-arrays container for circuit components.
+    
+    Names, types and pin counts are kept in parallel columns, and the polygon
+    vertices of every component live in one flat (N, 2) coordinate buffer
+    indexed by ``poly_offsets`` (CSR layout). ``upload`` rebinds each
+    component's geometry to a view of that buffer, so every vertex is stored
+    once and the analysis reads all polygons from contiguous memory.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.components: List[CircuitComponent] = []
+        self.names: List[str] = []
+        self.types: List[str] = []
+        self._pin_counts: List[int] = []
+        self._offsets: List[int] = [0]
+        self._xy = np.empty((capacity, 2), dtype=np.float64)
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return len(self.components)
+    
+    def __iter__(self):
+        return iter(self.components)
+    
+    def _reserve(self, extra: int):
+        """Grow the vertex buffer geometrically to fit `extra` more vertices."""
+        needed = self._size + extra
+        if needed <= len(self._xy):
+            return
+        grown = np.empty((max(needed, 2 * len(self._xy)), 2), dtype=np.float64)
+        grown[:self._size] = self._xy[:self._size]
+        self._xy = grown
+    
+    def add(self, component: CircuitComponent):
+        """Append a component and copy its vertices into the flat buffer."""
+        coords = component.geometry.to_numpy()
+        self._reserve(len(coords))
+        
+        end = self._size + len(coords)
+        self._xy[self._size:end] = coords
+        self._size = end
+        self._offsets.append(end)
+        
+        self.components.append(component)
+        self.names.append(component.name)
+        self.types.append(component.component_type)
+        self._pin_counts.append(len(component.pins))
+    
+    def extend(self, components):
+        """Append several components."""
+        for component in components:
+            self.add(component)
+    
+    @property
+    def vertex_xs(self) -> np.ndarray:
+        return self._xy[:self._size, 0]
+    
+    @property
+    def vertex_ys(self) -> np.ndarray:
+        return self._xy[:self._size, 1]
+    
+    @property
+    def poly_offsets(self) -> np.ndarray:
+        return np.asarray(self._offsets, dtype=np.intp)
+    
+    @property
+    def pin_counts(self) -> np.ndarray:
+        return np.asarray(self._pin_counts, dtype=np.intp)
+    
+    def upload(self, processor):
+        """Add every component to a GeometryProcessor in one batch.
+        
+        The uploaded polygons are views into the table's vertex buffer and
+        replace the components' original geometries.
+        """
+        blocks = np.split(self._xy[:self._size], self.poly_offsets[1:-1])
+        polygons = [zlayout.Polygon.from_array(block) for block in blocks]
+        for component, polygon in zip(self.components, polygons):
+            component.geometry = polygon
+        return processor.add_components(polygons)
+
+
 def create_microcontroller(x: float, y: float) -> CircuitComponent:
     """Create a microcontroller component."""
     # Main body (rectangle)
@@ -63,23 +153,8 @@ def create_resistor(x: float, y: float, rotation: float = 0) -> CircuitComponent
     # Basic resistor shape
     length, width = 6, 2
     
-    # Create resistor body
-    vertices = [
-        zlayout.Point(-length/2, -width/2),
-        zlayout.Point(length/2, -width/2),
-        zlayout.Point(length/2, width/2),
-        zlayout.Point(-length/2, width/2)
-    ]
-    
-    # Apply rotation and translation
-    cos_r, sin_r = math.cos(rotation), math.sin(rotation)
-    rotated_vertices = []
-    for v in vertices:
-        new_x = v.x * cos_r - v.y * sin_r + x
-        new_y = v.x * sin_r + v.y * cos_r + y
-        rotated_vertices.append(zlayout.Point(new_x, new_y))
-    
-    geometry = zlayout.Polygon(rotated_vertices)
+    # Rotated and translated resistor body
+    geometry = zlayout.Polygon.from_array(rotated_rect(x, y, rotation, length, width))
     resistor = CircuitComponent("R1", geometry, "resistor")
     
     # Add connection points
@@ -89,6 +164,39 @@ def create_resistor(x: float, y: float, rotation: float = 0) -> CircuitComponent
     return resistor
 
 
+def create_resistors_batch(xs, ys, rotations, length: float = 6, width: float = 2) -> np.ndarray:
+    """Compute the bodies of N rotated resistors in one vectorized pass.
+    
+    Args:
+        xs, ys: (N,) arrays of resistor centers
+        rotations: (N,) array of rotations in radians
+        length, width: Resistor body dimensions shared by the batch
+        
+    Returns:
+        (N, 4, 2) array of body vertices, matching create_resistor per row
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    c, s = np.cos(rotations), np.sin(rotations)
+    
+    base = np.array([[-length/2, -width/2], [length/2, -width/2],
+                     [length/2, width/2], [-length/2, width/2]])
+    rot = np.stack([np.stack([c, -s], -1), np.stack([s, c], -1)], -2)  # (N, 2, 2)
+    return base @ rot.transpose(0, 2, 1) + np.stack([xs, ys], -1)[:, None, :]
+
+
+def create_resistors(xs, ys, rotations, length: float = 6, width: float = 2) -> list:
+    """Create resistor components for N placements from a single batched kernel call."""
+    bodies = create_resistors_batch(xs, ys, rotations, length, width)
+    resistors = []
+    for x, y, body in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist(), bodies):
+        resistor = CircuitComponent("R1", zlayout.Polygon.from_array(body), "resistor")
+        resistor.add_pin(zlayout.Point(x - length/2, y), "1")
+        resistor.add_pin(zlayout.Point(x + length/2, y), "2")
+        resistors.append(resistor)
+    return resistors
+
+
 def create_capacitor(x: float, y: float) -> CircuitComponent:
     """Create a capacitor component."""
     # Capacitor body (smaller rectangle)
@@ -103,31 +211,48 @@ def create_capacitor(x: float, y: float) -> CircuitComponent:
 
 def create_trace(start: zlayout.Point, end: zlayout.Point, width: float = 0.3) -> CircuitComponent:
     """Create a PCB trace (connection line with width)."""
-    # Calculate perpendicular vector for width
-    dx = end.x - start.x
-    dy = end.y - start.y
-    length = math.sqrt(dx*dx + dy*dy)
-    
-    if length < 1e-10:
-        # Degenerate trace
-        geometry = zlayout.Rectangle(start.x, start.y, 0.1, 0.1).to_polygon()
-    else:
-        # Normalized perpendicular vector
-        perp_x = -dy * width / (2 * length)
-        perp_y = dx * width / (2 * length)
-        
-        # Create trace as a polygon
-        vertices = [
-            zlayout.Point(start.x + perp_x, start.y + perp_y),
-            zlayout.Point(end.x + perp_x, end.y + perp_y),
-            zlayout.Point(end.x - perp_x, end.y - perp_y),
-            zlayout.Point(start.x - perp_x, start.y - perp_y)
-        ]
-        geometry = zlayout.Polygon(vertices)
-    
+    geometry = zlayout.Polygon.from_array(trace_quad(start.x, start.y, end.x, end.y, width))
     return CircuitComponent("Trace", geometry, "trace")
 
 
+def create_traces_batch(starts: np.ndarray, ends: np.ndarray, widths) -> np.ndarray:
+    """Compute the polygons of N straight traces in one vectorized pass.
+    
+    Args:
+        starts: (N, 2) array of trace start points
+        ends: (N, 2) array of trace end points
+        widths: (N,) array of trace widths, or a scalar width for all traces
+        
+    Returns:
+        (N, 4, 2) array of trace vertices, matching create_trace per row
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    widths = np.broadcast_to(np.asarray(widths, dtype=np.float64), starts.shape[:1])
+    
+    d = ends - starts
+    lengths = np.hypot(d[:, 0], d[:, 1])
+    degenerate = lengths < 1e-10
+    
+    # Normalized perpendicular vectors scaled to half the width
+    scale = widths / (2 * np.where(degenerate, 1.0, lengths))
+    perp = np.stack([-d[:, 1], d[:, 0]], axis=-1) * scale[:, None]
+    verts = np.stack([starts + perp, ends + perp, ends - perp, starts - perp], axis=1)
+    
+    # Zero-length traces become a 0.1 x 0.1 square anchored at the start point
+    if degenerate.any():
+        square = np.array([[0.0, 0.0], [0.1, 0.0], [0.1, 0.1], [0.0, 0.1]])
+        verts[degenerate] = starts[degenerate, None, :] + square
+    
+    return verts
+
+
+def create_traces(starts, ends, widths) -> list:
+    """Create trace components for N traces from a single batched kernel call."""
+    return [CircuitComponent("Trace", zlayout.Polygon.from_array(quad), "trace")
+            for quad in create_traces_batch(starts, ends, widths)]
+
+
 def create_complex_circuit_layout():
     """Create a complex circuit layout with multiple components."""
     
@@ -135,88 +260,76 @@ def create_complex_circuit_layout():
     world_bounds = zlayout.Rectangle(0, 0, 150, 100)
     processor = zlayout.GeometryProcessor(world_bounds)
     
-    components = []
+    components = ComponentTable()
     
     # Add microcontroller
-    mcu = create_microcontroller(30, 40)
-    components.append(mcu)
-    processor.add_component(mcu.geometry)
-    
-    # Add resistors in various orientations
-    resistors = [
-        create_resistor(60, 50, 0),           # Horizontal
-        create_resistor(75, 35, math.pi/2),   # Vertical  
-        create_resistor(90, 55, math.pi/4),   # 45 degrees
-        create_resistor(20, 25, 0),           # Near MCU
-    ]
-    
-    for resistor in resistors:
-        components.append(resistor)
-        processor.add_component(resistor.geometry)
+    components.add(create_microcontroller(30, 40))
+    
+    # Add resistors in various orientations (x, y, rotation)
+    resistors = np.array([
+        [60, 50, 0],           # Horizontal
+        [75, 35, math.pi/2],   # Vertical
+        [90, 55, math.pi/4],   # 45 degrees
+        [20, 25, 0],           # Near MCU
+    ], dtype=np.float64)
+    components.extend(create_resistors(resistors[:, 0], resistors[:, 1], resistors[:, 2]))
     
     # Add capacitors
-    capacitors = [
+    components.extend([
         create_capacitor(50, 25),
         create_capacitor(70, 65),
         create_capacitor(100, 40),
-    ]
-    
-    for cap in capacitors:
-        components.append(cap)
-        processor.add_component(cap.geometry)
+    ])
     
-    # Add traces connecting components
-    traces = [
+    # Add traces connecting components (start x, start y, end x, end y, width)
+    traces = np.array([
         # Connect MCU to resistors
-        create_trace(zlayout.Point(45, 47), zlayout.Point(54, 50), 0.2),
-        create_trace(zlayout.Point(37, 55), zlayout.Point(37, 65), 0.2),
+        [45, 47, 54, 50, 0.2],
+        [37, 55, 37, 65, 0.2],
         
-        # Connect resistors to capacitors  
-        create_trace(zlayout.Point(66, 50), zlayout.Point(68, 65), 0.2),
-        create_trace(zlayout.Point(75, 45), zlayout.Point(98, 40), 0.2),
+        # Connect resistors to capacitors
+        [66, 50, 68, 65, 0.2],
+        [75, 45, 98, 40, 0.2],
         
         # Some traces that might cause narrow spacing issues
-        create_trace(zlayout.Point(85, 50), zlayout.Point(85, 60), 0.15),
-        create_trace(zlayout.Point(87, 50), zlayout.Point(87, 60), 0.15),
-    ]
-    
-    for trace in traces:
-        components.append(trace)
-        processor.add_component(trace.geometry)
+        [85, 50, 85, 60, 0.15],
+        [87, 50, 87, 60, 0.15],
+    ], dtype=np.float64)
+    components.extend(create_traces(traces[:, 0:2], traces[:, 2:4], traces[:, 4]))
     
     # Add some problematic geometries to test analysis
     
     # Sharp angled component (connector)
-    sharp_connector = zlayout.Polygon([
-        zlayout.Point(110, 20),
-        zlayout.Point(125, 22),
-        zlayout.Point(112, 28),  # This creates a sharp angle
-        zlayout.Point(108, 24)
-    ])
-    components.append(CircuitComponent("Connector", sharp_connector, "connector"))
-    processor.add_component(sharp_connector)
+    sharp_connector = zlayout.Polygon(np.array([
+        [110, 20],
+        [125, 22],
+        [112, 28],  # This creates a sharp angle
+        [108, 24]
+    ], dtype=np.float64))
+    components.add(CircuitComponent("Connector", sharp_connector, "connector"))
     
     # Potentially intersecting components
-    overlap_poly1 = zlayout.Polygon([
-        zlayout.Point(15, 70),
-        zlayout.Point(25, 72),
-        zlayout.Point(23, 82),
-        zlayout.Point(13, 80)
-    ])
-    
-    overlap_poly2 = zlayout.Polygon([
-        zlayout.Point(20, 75),
-        zlayout.Point(30, 77),
-        zlayout.Point(28, 87),
-        zlayout.Point(18, 85)
-    ])
+    overlap_poly1 = zlayout.Polygon(np.array([
+        [15, 70],
+        [25, 72],
+        [23, 82],
+        [13, 80]
+    ], dtype=np.float64))
+    
+    overlap_poly2 = zlayout.Polygon(np.array([
+        [20, 75],
+        [30, 77],
+        [28, 87],
+        [18, 85]
+    ], dtype=np.float64))
     
     components.extend([
         CircuitComponent("Test1", overlap_poly1, "test"),
         CircuitComponent("Test2", overlap_poly2, "test")
     ])
-    processor.add_component(overlap_poly1)
-    processor.add_component(overlap_poly2)
+    
+    # Upload all geometry to the processor in one batch
+    components.upload(processor)
     
     return processor, components
 
@@ -224,7 +337,7 @@ def create_complex_circuit_layout():
 def analyze_manufacturing_constraints(processor):
     """Analyze the layout for manufacturing constraints."""
     
-    print("=== Manufacturing Constraint Analysis ===\n")
+    lines = ["=== Manufacturing Constraint Analysis ===\n"]
     
     # Different constraint levels for different processes
     constraints = {
@@ -233,12 +346,16 @@ def analyze_manufacturing_constraints(processor):
         "high_density": {"min_spacing": 0.05, "min_trace_width": 0.05, "sharp_angle_limit": 15}
     }
     
+    # The geometric work is threshold-independent, so do it once for all processes
+    raw = processor.analyze_layout_raw()
+    
     for process_name, limits in constraints.items():
-        print(f"--- {process_name.upper()} PROCESS ---")
+        lines.append(f"--- {process_name.upper()} PROCESS ---")
         
         analysis = processor.analyze_layout(
             sharp_angle_threshold=limits["sharp_angle_limit"],
-            narrow_distance_threshold=limits["min_spacing"]
+            narrow_distance_threshold=limits["min_spacing"],
+            raw=raw
         )
         
         # Check manufacturability
@@ -246,25 +363,32 @@ def analyze_manufacturing_constraints(processor):
         
         if analysis['sharp_angles']['count'] > 0:
             violations += analysis['sharp_angles']['count']
-            print(f"  ⚠️  Sharp angles: {analysis['sharp_angles']['count']} violations")
+            lines.append(f"  ⚠️  Sharp angles: {analysis['sharp_angles']['count']} violations")
         
         if analysis['narrow_distances']['count'] > 0:
             violations += analysis['narrow_distances']['count'] 
-            print(f"  ⚠️  Spacing violations: {analysis['narrow_distances']['count']}")
-            print(f"     Minimum distance: {analysis['narrow_distances']['minimum']:.3f}")
+            lines.append(f"  ⚠️  Spacing violations: {analysis['narrow_distances']['count']}")
+            lines.append(f"     Minimum distance: {analysis['narrow_distances']['minimum']:.3f}")
         
         if analysis['intersections']['polygon_pairs'] > 0:
             violations += analysis['intersections']['polygon_pairs']
-            print(f"  ❌ Intersections: {analysis['intersections']['polygon_pairs']} pairs")
+            lines.append(f"  ❌ Intersections: {analysis['intersections']['polygon_pairs']} pairs")
         
         if violations == 0:
-            print(f"  ✅ Manufacturable with {process_name} process")
+            lines.append(f"  ✅ Manufacturable with {process_name} process")
         else:
-            print(f"  ❌ {violations} total violations for {process_name} process")
+            lines.append(f"  ❌ {violations} total violations for {process_name} process")
         
-        print()
+        lines.append("")
+    
+    print("\n".join(lines))
     
-    return processor.optimize_layout()
+    return processor.optimize_layout(raw=raw)
+
+
+# Layout quality buckets: scores below QUALITY_THRESHOLDS[i] fall into QUALITY_BUCKETS[i]
+QUALITY_THRESHOLDS = [50, 70, 90]
+QUALITY_BUCKETS = [("NEEDS WORK", "🔴"), ("ACCEPTABLE", "🟠"), ("GOOD", "🟡"), ("EXCELLENT", "🟢")]
 
 
 def demonstrate_design_rule_checking():
@@ -281,35 +405,20 @@ def demonstrate_design_rule_checking():
     # Component-specific analysis
     print("--- COMPONENT ANALYSIS ---")
     
-    component_types = {}
-    for comp in components:
-        comp_type = comp.component_type
-        if comp_type not in component_types:
-            component_types[comp_type] = 0
-        component_types[comp_type] += 1
+    component_types = Counter(components.types)
     
     print("Component count by type:")
     for comp_type, count in component_types.items():
         print(f"  {comp_type}: {count}")
     
     print(f"\nTotal components: {len(components)}")
+    print(f"Total vertices: {len(components.vertex_xs)}")
     
     # Generate comprehensive report
     print("\n--- DRC SUMMARY REPORT ---")
     score = optimization_results['optimization_score']
     
-    if score >= 90:
-        status = "EXCELLENT"
-        emoji = "🟢"
-    elif score >= 70:
-        status = "GOOD"  
-        emoji = "🟡"
-    elif score >= 50:
-        status = "ACCEPTABLE"
-        emoji = "🟠"
-    else:
-        status = "NEEDS WORK"
-        emoji = "🔴"
+    status, emoji = QUALITY_BUCKETS[bisect.bisect_right(QUALITY_THRESHOLDS, score)]
     
     print(f"Overall Layout Quality: {emoji} {status} ({score:.1f}/100)")
     
@@ -333,9 +442,16 @@ def main():
     processor, components, optimization_results = demonstrate_design_rule_checking()
     
     # Generate visualizations
+    if os.environ.get('ZLAYOUT_NOVIZ'):
+        print("\nZLAYOUT_NOVIZ is set. Skipping visualization generation.")
+        print("\n✅ Advanced EDA analysis completed!")
+        return
+    
     print("\n=== Visualization Generation ===")
     
     try:
+        import matplotlib.pyplot as plt
+        
         visualizer = zlayout.LayoutVisualizer(figsize=(16, 12))
         
         # Extract just the geometries for visualization
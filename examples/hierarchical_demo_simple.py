@@ -11,23 +11,50 @@
 模拟了从基础元器件到十亿级芯片设计的层次化组合过程
 """
 
+import sys
 import time
-import random
 import math
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterator
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
 
-class ComponentCategory(Enum):
-    PASSIVE = "passive"
-    DIGITAL = "digital"  
-    ANALOG = "analog"
-    MEMORY = "memory"
-    PROCESSOR = "processor"
-    IP_BLOCK = "ip_block"
+import numpy as np
+
+# 可选的numba加速，未安装时退回NumPy向量化实现
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _sim_kernel(xs, ys, ws, hs):
+        """模拟优化步骤：遍历组件坐标并累加加权边界框"""
+        s = 0.0
+        for i in range(xs.size):
+            s += xs[i] * ws[i] + ys[i] * hs[i]
+        return s
+else:
+    def _sim_kernel(xs, ys, ws, hs):
+        """模拟优化步骤：遍历组件坐标并累加加权边界框"""
+        return float(np.dot(xs, ws) + np.dot(ys, hs))
+
+class ComponentCategory(IntEnum):
+    # 小整数取值，类别比较和集合查找都是整数运算
+    PASSIVE = 0
+    DIGITAL = 1
+    ANALOG = 2
+    MEMORY = 3
+    PROCESSOR = 4
+    IP_BLOCK = 5
 
 @dataclass
 class Rectangle:
+    # 字段均无默认值，可直接声明 __slots__（dataclass(slots=True) 需要 Python 3.10）
+    __slots__ = ('x', 'y', 'width', 'height')
+    
     x: float
     y: float
     width: float
@@ -42,77 +69,225 @@ class Rectangle:
 
 @dataclass
 class Point:
+    __slots__ = ('x', 'y')
+    
     x: float
     y: float
     
+    def distance_sq_to(self, other: 'Point') -> float:
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+    
     def distance_to(self, other: 'Point') -> float:
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        return math.sqrt(self.distance_sq_to(other))
 
 class Component:
     """层次化组件基类"""
     
-    def __init__(self, name: str, category: ComponentCategory):
-        self.name = name
+    __slots__ = ('_name', '_name_index', 'category', 'children', 'parent', '_slot', 'properties',
+                 '_child_xywh', '_gate_cache', '_bbox_cache', '_position', '_bounding_box')
+    
+    # 子组件数低于该值时用纯Python单次遍历计算层次化边界框
+    _SMALL_BBOX_CHILDREN = 32
+    
+    def __init__(self, name: str, category: ComponentCategory, name_index: Optional[int] = None):
+        # 带编号的名称（如 AND_3）只保存驻留的前缀和编号，访问 name 时才格式化
+        self._name = sys.intern(name) if name_index is not None else name
+        self._name_index = name_index
         self.category = category
-        self.position = Point(0, 0)
-        self.bounding_box = Rectangle(0, 0, 1, 1)
         self.children: List['Component'] = []
         self.parent: Optional['Component'] = None
+        self._slot = -1  # 在父组件子缓冲区中的行号
         self.properties: Dict[str, Any] = {}
+        # 子组件边界框的SoA缓冲区，每行为 [x, y, width, height]（已叠加子组件位置），
+        # 容量不足时按倍数增长
+        self._child_xywh = np.empty((0, 4), dtype=np.float64)
+        # 子树门数和层次化边界框的缓存，子组件变化时失效
+        self._gate_cache: Optional[int] = None
+        self._bbox_cache: Optional[Rectangle] = None
+        self.position = Point(0, 0)
+        self.bounding_box = Rectangle(0, 0, 1, 1)
+    
+    @property
+    def name(self) -> str:
+        if self._name_index is None:
+            return self._name
+        return f"{self._name}_{self._name_index}"
+    
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+        self._name_index = None
+    
+    # 位置和边界框通过属性赋值时同步到父组件的缓冲区
+    # （直接修改 position.x 等字段不会同步）
+    @property
+    def position(self) -> Point:
+        return self._position
+    
+    @position.setter
+    def position(self, value: Point):
+        self._position = value
+        if self.parent is not None:
+            self.parent._write_child_row(self._slot, self)
+    
+    @property
+    def bounding_box(self) -> Rectangle:
+        return self._bounding_box
+    
+    @bounding_box.setter
+    def bounding_box(self, value: Rectangle):
+        self._bounding_box = value
+        if self.parent is not None:
+            self.parent._write_child_row(self._slot, self)
+    
+    def _write_child_row(self, slot: int, child: 'Component'):
+        """把子组件的全局边界框写入缓冲区"""
+        bbox = child._bounding_box
+        self._child_xywh[slot] = (child._position.x + bbox.x, child._position.y + bbox.y,
+                                  bbox.width, bbox.height)
+        self._bbox_cache = None
         
     def add_child(self, child: 'Component'):
         """添加子组件"""
+        slot = len(self.children)
+        if slot == len(self._child_xywh):
+            grown = np.empty((max(4, 2 * slot), 4), dtype=np.float64)
+            grown[:slot] = self._child_xywh
+            self._child_xywh = grown
+        
         self.children.append(child)
         child.parent = self
+        child._slot = slot
+        self._write_child_row(slot, child)
+        
+        self._invalidate_gate_counts()
+    
+    def add_children_bulk(self, children: List['Component']):
+        """批量添加子组件，缓冲区只扩容一次，祖先缓存只失效一次"""
+        if not children:
+            return
+        
+        start = len(self.children)
+        end = start + len(children)
+        if end > len(self._child_xywh):
+            grown = np.empty((max(4, end, 2 * start), 4), dtype=np.float64)
+            grown[:start] = self._child_xywh[:start]
+            self._child_xywh = grown
+        
+        for slot, child in enumerate(children, start):
+            child.parent = self
+            child._slot = slot
+        self.children.extend(children)
+        
+        self._child_xywh[start:end] = [
+            (c._position.x + c._bounding_box.x, c._position.y + c._bounding_box.y,
+             c._bounding_box.width, c._bounding_box.height)
+            for c in children
+        ]
+        self._bbox_cache = None
+        self._invalidate_gate_counts()
+    
+    def _invalidate_gate_counts(self):
+        """门数变化沿父链向上传播"""
+        node = self
+        while node is not None and node._gate_cache is not None:
+            node._gate_cache = None
+            node = node.parent
         
     def calculate_hierarchical_bbox(self) -> Rectangle:
         """计算层次化边界框"""
         if not self.children:
             return self.bounding_box
-            
-        min_x = min(child.position.x + child.bounding_box.x for child in self.children)
-        min_y = min(child.position.y + child.bounding_box.y for child in self.children)
-        max_x = max(child.position.x + child.bounding_box.x + child.bounding_box.width 
-                   for child in self.children)
-        max_y = max(child.position.y + child.bounding_box.y + child.bounding_box.height 
-                   for child in self.children)
+        
+        if self._bbox_cache is None:
+            if len(self.children) < self._SMALL_BBOX_CHILDREN:
+                self._bbox_cache = self._small_hierarchical_bbox()
+            else:
+                boxes = self._child_xywh[:len(self.children)]
+                mn = boxes[:, :2].min(axis=0)
+                mx = (boxes[:, :2] + boxes[:, 2:]).max(axis=0)
+                self._bbox_cache = Rectangle(float(mn[0]), float(mn[1]),
+                                             float(mx[0] - mn[0]), float(mx[1] - mn[1]))
+        
+        return self._bbox_cache
+    
+    def _small_hierarchical_bbox(self) -> Rectangle:
+        """子组件较少时单次遍历同时求四个极值，省去NumPy调用开销"""
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        for child in self.children:
+            bbox = child._bounding_box
+            x = float(child._position.x + bbox.x)
+            y = float(child._position.y + bbox.y)
+            right = x + bbox.width
+            top = y + bbox.height
+            if x < min_x:
+                min_x = x
+            if y < min_y:
+                min_y = y
+            if right > max_x:
+                max_x = right
+            if top > max_y:
+                max_y = top
         
         return Rectangle(min_x, min_y, max_x - min_x, max_y - min_y)
     
     def get_total_gate_count(self) -> int:
-        """获取总门数量"""
-        if not self.children:
-            return self.properties.get('gate_count', 1)
+        """获取总门数量（按节点缓存，叶子节点的 gate_count 应在首次查询前设置）"""
+        if self._gate_cache is None:
+            if not self.children:
+                self._gate_cache = self.properties.get('gate_count', 1)
+            else:
+                self._gate_cache = sum(child.get_total_gate_count() for child in self.children)
         
-        return sum(child.get_total_gate_count() for child in self.children)
+        return self._gate_cache
     
     def flatten_hierarchy(self) -> List['Component']:
-        """展平层次结构"""
-        result = [self]
-        for child in self.children:
-            result.extend(child.flatten_hierarchy())
-        return result
+        """展平层次结构（先序）"""
+        return list(self.iter_flat())
+    
+    def iter_flat(self) -> Iterator['Component']:
+        """按先序逐个产出子树中的组件，不受递归深度限制"""
+        stack = deque([self])
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+    
+    def refit_bboxes(self):
+        """自底向上重新计算整棵子树的层次化边界框（迭代后序，O(N)）"""
+        for node in reversed(self.flatten_hierarchy()):
+            if node.children:
+                node.bounding_box = node.calculate_hierarchical_bbox()
 
 class PassiveComponent(Component):
     """无源器件"""
     
+    __slots__ = ('component_type', 'value')
+    
+    _UNITS = {'R': 'Ω', 'L': 'H', 'C': 'F'}
+    
     def __init__(self, name: str, component_type: str, value: float):
         super().__init__(name, ComponentCategory.PASSIVE)
-        self.component_type = component_type  # R, L, C
+        self.component_type = sys.intern(component_type)  # R, L, C
         self.value = value
         self.properties['gate_count'] = 0  # 无源器件无门数
         
     def __str__(self) -> str:
-        units = {'R': 'Ω', 'L': 'H', 'C': 'F'}
-        unit = units.get(self.component_type, '')
+        unit = self._UNITS.get(self.component_type, '')
         return f"{self.component_type}({self.value}{unit})"
 
 class DigitalGate(Component):
     """数字门电路"""
     
-    def __init__(self, name: str, gate_type: str, input_count: int = 2):
-        super().__init__(name, ComponentCategory.DIGITAL)
-        self.gate_type = gate_type
+    __slots__ = ('gate_type', 'input_count')
+    
+    def __init__(self, name: str, gate_type: str, input_count: int = 2,
+                 name_index: Optional[int] = None):
+        super().__init__(name, ComponentCategory.DIGITAL, name_index)
+        self.gate_type = sys.intern(gate_type)
         self.input_count = input_count
         self.properties['gate_count'] = 1
         self.bounding_box = Rectangle(0, 0, 2, 1.5)
@@ -123,43 +298,42 @@ class DigitalGate(Component):
 class ALU(Component):
     """算术逻辑单元"""
     
+    __slots__ = ('bit_width',)
+    
     def __init__(self, name: str, bit_width: int = 8):
         super().__init__(name, ComponentCategory.DIGITAL)
         self.bit_width = bit_width
         
-        # 创建ALU的内部结构
+        # 创建ALU的内部结构，先收集全部子组件再一次性添加
+        children: List[Component] = []
         gate_count = 0
         for i in range(bit_width):
             # 每个位需要多个门
-            and_gate = DigitalGate(f"AND_{i}", "AND", 2)
-            and_gate.position = Point(i * 3, 0)
-            self.add_child(and_gate)
-            
-            or_gate = DigitalGate(f"OR_{i}", "OR", 2) 
-            or_gate.position = Point(i * 3, 2)
-            self.add_child(or_gate)
-            
-            xor_gate = DigitalGate(f"XOR_{i}", "XOR", 2)
-            xor_gate.position = Point(i * 3, 4)
-            self.add_child(xor_gate)
+            for gate_type, y in (("AND", 0), ("OR", 2), ("XOR", 4)):
+                gate = DigitalGate(gate_type, gate_type, 2, name_index=i)
+                gate.position = Point(i * 3, y)
+                children.append(gate)
             
             gate_count += 3
             
         # 全加器用于算术运算
         for i in range(bit_width):
-            adder = Component(f"ADDER_{i}", ComponentCategory.DIGITAL)
+            adder = Component("ADDER", ComponentCategory.DIGITAL, name_index=i)
             adder.properties['gate_count'] = 5  # 全加器约5个门
             adder.position = Point(i * 4, 6)
             adder.bounding_box = Rectangle(0, 0, 3, 2)
-            self.add_child(adder)
+            children.append(adder)
             gate_count += 5
-            
+        
+        self.add_children_bulk(children)
         self.bounding_box = self.calculate_hierarchical_bbox()
         print(f"创建ALU: {bit_width}位, 共{gate_count}个门, 面积: {self.bounding_box.area:.1f}")
 
 class ProcessorCore(Component):
     """处理器核心"""
     
+    __slots__ = ('architecture', 'core_count')
+    
     def __init__(self, name: str, architecture: str, core_count: int = 4):
         super().__init__(name, ComponentCategory.PROCESSOR)
         self.architecture = architecture
@@ -193,13 +367,15 @@ class ProcessorCore(Component):
 class GPU(Component):
     """图形处理器"""
     
+    __slots__ = ('compute_units',)
+    
     def __init__(self, name: str, compute_units: int = 16):
         super().__init__(name, ComponentCategory.PROCESSOR) 
         self.compute_units = compute_units
         
         # 创建计算单元
         for i in range(compute_units):
-            cu = Component(f"CU_{i}", ComponentCategory.DIGITAL)
+            cu = Component("CU", ComponentCategory.DIGITAL, name_index=i)
             cu.properties['gate_count'] = 50000  # 每个计算单元5万门
             cu.position = Point((i % 4) * 20, (i // 4) * 15)
             cu.bounding_box = Rectangle(0, 0, 18, 12)
@@ -213,6 +389,19 @@ class GPU(Component):
 class SoC(Component):
     """片上系统"""
     
+    __slots__ = ('part_number',)
+    
+    # 固定拓扑的叶子IP块: (名称, 类别, 门数, x, y, 宽, 高)
+    _FIXED_BLOCKS = (
+        ("DSP", ComponentCategory.DIGITAL, 200000, 300, 0, 40, 30),
+        ("Memory_Controller", ComponentCategory.MEMORY, 100000, 0, 100, 60, 25),
+        # 各种接口
+        ("USB3_IF", ComponentCategory.DIGITAL, 20000, 100, 100, 20, 15),
+        ("PCIe4_IF", ComponentCategory.DIGITAL, 20000, 125, 100, 20, 15),
+        ("Ethernet_IF", ComponentCategory.DIGITAL, 20000, 150, 100, 20, 15),
+        ("WiFi_IF", ComponentCategory.DIGITAL, 20000, 175, 100, 20, 15),
+    )
+    
     def __init__(self, name: str, part_number: str):
         super().__init__(name, ComponentCategory.IP_BLOCK)
         self.part_number = part_number
@@ -220,41 +409,144 @@ class SoC(Component):
         # 添加CPU
         cpu = ProcessorCore("CPU_Cluster", "ARM_Cortex_A78", 8)
         cpu.position = Point(0, 0)
-        self.add_child(cpu)
         
         # 添加GPU
         gpu = GPU("Mali_GPU", 32)
         gpu.position = Point(150, 0)
-        self.add_child(gpu)
-        
-        # 添加DSP
-        dsp = Component("DSP", ComponentCategory.DIGITAL)
-        dsp.properties['gate_count'] = 200000
-        dsp.position = Point(300, 0)
-        dsp.bounding_box = Rectangle(0, 0, 40, 30)
-        self.add_child(dsp)
-        
-        # 添加存储控制器
-        memory_ctrl = Component("Memory_Controller", ComponentCategory.MEMORY)
-        memory_ctrl.properties['gate_count'] = 100000
-        memory_ctrl.position = Point(0, 100)
-        memory_ctrl.bounding_box = Rectangle(0, 0, 60, 25)
-        self.add_child(memory_ctrl)
-        
-        # 添加各种接口
-        interfaces = ["USB3", "PCIe4", "Ethernet", "WiFi"]
-        for i, iface in enumerate(interfaces):
-            interface = Component(f"{iface}_IF", ComponentCategory.DIGITAL)
-            interface.properties['gate_count'] = 20000
-            interface.position = Point(100 + i * 25, 100)
-            interface.bounding_box = Rectangle(0, 0, 20, 15)
-            self.add_child(interface)
-            
+        
+        # 添加DSP、存储控制器和各种接口
+        children: List[Component] = [cpu, gpu]
+        for block_name, category, gate_count, x, y, width, height in self._FIXED_BLOCKS:
+            block = Component(block_name, category)
+            block.properties['gate_count'] = gate_count
+            block.position = Point(x, y)
+            block.bounding_box = Rectangle(0, 0, width, height)
+            children.append(block)
+        
+        self.add_children_bulk(children)
         self.bounding_box = self.calculate_hierarchical_bbox()
         total_gates = self.get_total_gate_count()
         print(f"创建SoC: {part_number}, 共{total_gates:,}个门, "
               f"面积: {self.bounding_box.area:.1f}")
 
+class ComponentInstance(Component):
+    """组件实例（单元实例化）
+    
+    与模板共享子树，只保存自身的名称和位置；门数和边界框查询直接委托给模板。
+    模板在实例化之后不应再修改。
+    """
+    
+    __slots__ = ('master',)
+    
+    def __init__(self, name: str, master: Component):
+        super().__init__(name, master.category)
+        self.master = master
+        self.children = master.children
+        self.properties = master.properties
+        self.bounding_box = master.bounding_box
+    
+    def add_child(self, child: Component):
+        raise TypeError("不能向组件实例添加子组件，请修改其模板")
+    
+    def add_children_bulk(self, children: List[Component]):
+        raise TypeError("不能向组件实例添加子组件，请修改其模板")
+    
+    def calculate_hierarchical_bbox(self) -> Rectangle:
+        return self.master.calculate_hierarchical_bbox()
+    
+    def get_total_gate_count(self) -> int:
+        return self.master.get_total_gate_count()
+
+class ComponentArena:
+    """组件树的列式快照
+    
+    按层序（BFS）把整棵树展开到一组连续的NumPy数组中，每个节点的子节点
+    在数组中占据一段连续区间 [first_child, first_child + child_count)。
+    门数汇总和边界框重算都变成逐层的向量化归约，不再逐个对象追指针。
+    快照不会跟踪原树之后的修改。
+    """
+    
+    def __init__(self, root: Component):
+        nodes: List[Component] = [root]
+        first_child: List[int] = []
+        child_count: List[int] = []
+        parent: List[int] = [-1]
+        level_starts: List[int] = [0, 1]
+        
+        # 层序遍历：同一父节点的子节点连续排列，每一层也是连续区间
+        i = 0
+        while i < len(nodes):
+            children = nodes[i].children
+            first_child.append(len(nodes))
+            child_count.append(len(children))
+            nodes.extend(children)
+            parent.extend([i] * len(children))
+            i += 1
+            if i == level_starts[-1] and len(nodes) > i:
+                level_starts.append(len(nodes))
+        
+        n = len(nodes)
+        self.nodes = nodes
+        self.names = [node.name for node in nodes]
+        self.categories = np.fromiter((node.category for node in nodes), dtype=np.int8, count=n)
+        self.first_child = np.array(first_child, dtype=np.int32)
+        self.child_count = np.array(child_count, dtype=np.int32)
+        self.parent_idx = np.array(parent, dtype=np.int32)
+        self.level_starts = level_starts
+        
+        self.pos_x = np.fromiter((node._position.x for node in nodes), dtype=np.float64, count=n)
+        self.pos_y = np.fromiter((node._position.y for node in nodes), dtype=np.float64, count=n)
+        self.bb_x = np.fromiter((node._bounding_box.x for node in nodes), dtype=np.float64, count=n)
+        self.bb_y = np.fromiter((node._bounding_box.y for node in nodes), dtype=np.float64, count=n)
+        self.bb_w = np.fromiter((node._bounding_box.width for node in nodes), dtype=np.float64, count=n)
+        self.bb_h = np.fromiter((node._bounding_box.height for node in nodes), dtype=np.float64, count=n)
+        
+        # 叶子节点的门数取自属性，内部节点由 total_gate_counts() 汇总
+        leaf = self.child_count == 0
+        self.gate_count = np.zeros(n, dtype=np.int64)
+        self.gate_count[leaf] = [nodes[k].properties.get('gate_count', 1)
+                                 for k in np.flatnonzero(leaf).tolist()]
+    
+    def __len__(self) -> int:
+        return len(self.nodes)
+    
+    def _levels_bottom_up(self) -> Iterator[tuple]:
+        """自底向上产出每层的 (起始, 结束) 区间，不含根所在的第0层"""
+        bounds = self.level_starts + [len(self.nodes)]
+        for level in range(len(bounds) - 2, 0, -1):
+            yield bounds[level], bounds[level + 1]
+    
+    def total_gate_counts(self) -> np.ndarray:
+        """所有节点的子树门数，逐层累加到父节点"""
+        totals = self.gate_count.copy()
+        totals[self.child_count > 0] = 0
+        for lo, hi in self._levels_bottom_up():
+            np.add.at(totals, self.parent_idx[lo:hi], totals[lo:hi])
+        return totals
+    
+    def refit_bboxes(self):
+        """自底向上重算内部节点的层次化边界框（每层一次 reduceat）"""
+        for lo, hi in self._levels_bottom_up():
+            x = self.pos_x[lo:hi] + self.bb_x[lo:hi]
+            y = self.pos_y[lo:hi] + self.bb_y[lo:hi]
+            right = x + self.bb_w[lo:hi]
+            top = y + self.bb_h[lo:hi]
+            
+            # 本层的父节点及其子区间起点（层序保证起点递增且首尾相接）
+            parents = np.unique(self.parent_idx[lo:hi])
+            offsets = self.first_child[parents] - lo
+            min_x = np.minimum.reduceat(x, offsets)
+            min_y = np.minimum.reduceat(y, offsets)
+            self.bb_x[parents] = min_x
+            self.bb_y[parents] = min_y
+            self.bb_w[parents] = np.maximum.reduceat(right, offsets) - min_x
+            self.bb_h[parents] = np.maximum.reduceat(top, offsets) - min_y
+    
+    def bounding_box(self, index: int) -> Rectangle:
+        """第 index 个节点的边界框"""
+        return Rectangle(float(self.bb_x[index]), float(self.bb_y[index]),
+                         float(self.bb_w[index]), float(self.bb_h[index]))
+
 def demonstrate_basic_components():
     """演示基本组件创建"""
     print("\n=== 基本组件演示 ===")
@@ -306,6 +598,13 @@ def demonstrate_hierarchical_design():
             if len(child.children) > 3:
                 print(f"    - ... 还有 {len(child.children)-3} 个子组件")
     
+    # 列式快照：门数汇总和边界框重算按层向量化执行
+    arena = ComponentArena(soc)
+    arena.refit_bboxes()
+    print(f"\n列式快照: {len(arena):,} 个节点, {len(arena.level_starts)} 层, "
+          f"总门数 {int(arena.total_gate_counts()[0]):,}, "
+          f"边界框 {arena.bounding_box(0)}")
+    
     return soc
 
 def demonstrate_scalability():
@@ -313,9 +612,11 @@ def demonstrate_scalability():
     print("\n=== 可扩展性演示 ===")
     
     # 创建服务器级设计 - 多个SoC
+    # 各SoC拓扑相同，只构建一次模板，其余作为共享子树的实例
+    template = SoC("SoC_template", "Server_SoC")
     socs = []
     for i in range(16):  # 16个SoC的服务器
-        soc = SoC(f"SoC_{i}", f"Server_SoC_{i}")
+        soc = ComponentInstance(f"SoC_{i}", template)
         soc.position = Point((i % 4) * 400, (i // 4) * 150)
         socs.append(soc)
     
@@ -344,32 +645,37 @@ def benchmark_optimization():
         (10000000, "十亿级设计")
     ]
     
+    # 组件坐标和尺寸只生成一次，各规模使用前缀切片
+    rng = np.random.default_rng(0)
+    xs, ys, ws, hs = rng.random((4, scales[-1][0]), dtype=np.float32)
+    
+    # 预热，避免把JIT编译时间计入第一个规模
+    _sim_kernel(xs[:1], ys[:1], ws[:1], hs[:1])
+    
     for component_count, description in scales:
         print(f"\n{description} ({component_count:,} 组件):")
         
         # 模拟平坦优化
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 平坦优化：需要处理每个组件
-        iterations = min(1000, component_count // 100)
-        for _ in range(iterations):
-            # 模拟优化步骤
-            random.uniform(0, 1000)  # 模拟计算
+        _sim_kernel(xs[:component_count], ys[:component_count],
+                    ws[:component_count], hs[:component_count])
             
-        flat_time = time.time() - start_time
+        flat_time = time.perf_counter() - start_time
         
         # 模拟层次化优化
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 层次化优化：将组件分组
         block_size = min(component_count // 100, 10000)
         block_count = max(1, component_count // block_size)
         
-        # 只需要优化块级别
-        for _ in range(min(100, block_count)):
-            random.uniform(0, 1000)  # 模拟计算
+        # 只需要优化块级别：每块取一个代表组件
+        blocks = slice(0, block_count * block_size, block_size)
+        _sim_kernel(xs[blocks], ys[blocks], ws[blocks], hs[blocks])
             
-        hierarchical_time = time.time() - start_time
+        hierarchical_time = time.perf_counter() - start_time
         
         # 计算提升
         speedup = flat_time / hierarchical_time if hierarchical_time > 0 else float('inf')
@@ -133,11 +133,13 @@ def test_layout_analysis():
     for comp in components:
         processor.add_component(comp)
     
-    # Run analysis
+    # Run analysis; edge pairs further apart than the narrow threshold are skipped
     print("Running layout analysis...")
+    raw = processor.analyze_layout_raw(distance_cutoff=2.0)
     results = processor.analyze_layout(
         sharp_angle_threshold=45.0,
-        narrow_distance_threshold=2.0
+        narrow_distance_threshold=2.0,
+        raw=raw
     )
     
     # Print results
@@ -156,7 +158,7 @@ def test_layout_analysis():
     print(f"  Intersecting polygon pairs: {analysis['intersections']['polygon_pairs']}")
     
     # Get optimization suggestions
-    optimization = processor.optimize_layout()
+    optimization = processor.optimize_layout(raw=raw)
     print(f"\nOptimization Score: {optimization['optimization_score']:.1f}/100")
     
     if optimization['suggestions']:
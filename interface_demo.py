@@ -14,47 +14,46 @@ from zlayout import (
     create_flipflop, create_counter
 )
 
-def demo_basic_component_operations():
+def demo_basic_component_operations(manager):
     """演示基本组件操作"""
     print("=== 基本组件操作演示 ===")
     
-    # 创建组件管理器
-    manager = ComponentManager("demo_interface.db")
-    
     # 创建各种类型的组件
     print("\n--- 创建组件 ---")
     
-    # 数据库存储的模拟组件
-    resistor = manager.create_component(
-        "R1", 
-        parameters={"resistance": 10000, "tolerance": 0.01},
-        electrical_params={"max_voltage": 50.0, "power_rating": 0.25},
-        description="10kΩ 精密电阻"
-    )
-    
-    capacitor = manager.create_component(
-        "C1",
-        parameters={"capacitance": 100e-6, "tolerance": 0.05},
-        electrical_params={"voltage_rating": 25.0, "esr": 0.01},
-        description="100μF 电解电容"
-    )
-    
-    # 类定义的数字逻辑组件
-    flipflop = manager.create_component("FF1", "flipflop", flip_flop_type="D")
-    counter = manager.create_component("CNT1", "counter", width=8, count_up=True)
+    # 同一批组件在一个事务中写入数据库
+    with manager.batch():
+        # 数据库存储的模拟组件
+        resistor = manager.create_component(
+            "R1", 
+            parameters={"resistance": 10000, "tolerance": 0.01},
+            electrical_params={"max_voltage": 50.0, "power_rating": 0.25},
+            description="10kΩ 精密电阻"
+        )
+        
+        capacitor = manager.create_component(
+            "C1",
+            parameters={"capacitance": 100e-6, "tolerance": 0.05},
+            electrical_params={"voltage_rating": 25.0, "esr": 0.01},
+            description="100μF 电解电容"
+        )
+        
+        # 类定义的数字逻辑组件
+        flipflop = manager.create_component("FF1", "flipflop", flip_flop_type="D")
+        counter = manager.create_component("CNT1", "counter", width=8, count_up=True)
     
     print(f"✓ 创建了 {len(manager.list_components())} 个组件")
     for comp_name in manager.list_components():
         comp = manager.get_component(comp_name)
         print(f"  - {comp_name}: {comp.component_type.value} ({comp.category.value})")
     
-    return manager, resistor, capacitor, flipflop, counter
+    return resistor, capacitor, flipflop, counter
 
-def demo_component_information():
+def demo_component_information(manager):
     """演示组件信息获取"""
     print("\n=== 组件信息获取演示 ===")
     
-    manager, resistor, capacitor, flipflop, counter = demo_basic_component_operations()
+    resistor, capacitor, flipflop, counter = demo_basic_component_operations(manager)
     
     print("\n--- 电阻器信息 ---")
     r_info = resistor.get_info()
@@ -72,15 +71,11 @@ def demo_component_information():
         print(f"输入: {ff_info['inputs']}")
     if 'outputs' in ff_info:
         print(f"输出: {ff_info['outputs']}")
-    
-    manager.close()
 
-def demo_parameter_modification():
+def demo_parameter_modification(manager):
     """演示参数修改"""
     print("\n=== 参数修改演示 ===")
     
-    manager = ComponentManager("demo_interface.db")
-    
     # 创建一个计数器
     counter = manager.create_component("CNT_DEMO", "counter", width=4, count_up=True)
     
@@ -95,15 +90,11 @@ def demo_parameter_modification():
     print("\n--- 修改后 ---")
     print(f"计数器宽度: {counter.get_parameters().get('width', 'N/A')}")
     print(f"计数方向: {counter.get_parameters().get('count_up', 'N/A')}")
-    
-    manager.close()
 
-def demo_component_connections():
+def demo_component_connections(manager):
     """演示组件连接"""
     print("\n=== 组件连接演示 ===")
     
-    manager = ComponentManager("demo_interface.db")
-    
     # 创建组件
     resistor = manager.create_component(
         "R_CONN", 
@@ -130,15 +121,11 @@ def demo_component_connections():
     
     # 也可以使用管理器来连接
     manager.connect_components("R_CONN", "pin1", "C_CONN", "pin2")
-    
-    manager.close()
 
-def demo_logic_simulation():
+def demo_logic_simulation(manager):
     """演示逻辑仿真"""
     print("\n=== 逻辑仿真演示 ===")
     
-    manager = ComponentManager("demo_interface.db")
-    
     # 创建逻辑组件
     flipflop = manager.create_component("FF_SIM", "flipflop", flip_flop_type="D")
     counter = manager.create_component("CNT_SIM", "counter", width=4, count_up=True)
@@ -165,15 +152,11 @@ def demo_logic_simulation():
         current_state = params.get('current_state', {})
         count = current_state.get('count', 0)
         print(f"  步骤 {i+1}: 计数值 = {count}")
-    
-    manager.close()
 
-def demo_module_creation():
+def demo_module_creation(manager):
     """演示模块创建"""
     print("\n=== 模块创建演示 ===")
     
-    manager = ComponentManager("demo_interface.db")
-    
     # 创建模块组件
     components = []
     
@@ -219,23 +202,23 @@ def demo_module_creation():
     if module_info:
         print(f"  - 模块类型: {module_info['type'].value}")
         print(f"  - 包含组件: {list(module_info['components'].keys())}")
-    
-    manager.close()
 
-def demo_system_analysis():
+def demo_system_analysis(manager):
     """演示系统分析"""
     print("\n=== 系统分析演示 ===")
     
-    manager = ComponentManager("demo_interface.db")
+    # 只分析本演示创建的系统：清空之前的组件，数据库连接继续复用
+    manager.reset()
     
     # 创建混合系统
-    # 模拟前端
-    manager.create_component("INPUT_R", parameters={"resistance": 50})
-    manager.create_component("INPUT_C", parameters={"capacitance": 10e-12})
-    
-    # 数字后端
-    manager.create_component("DATA_FF", "flipflop", flip_flop_type="JK")
-    manager.create_component("ADDR_CNT", "counter", width=16, count_up=True)
+    with manager.batch():
+        # 模拟前端
+        manager.create_component("INPUT_R", parameters={"resistance": 50})
+        manager.create_component("INPUT_C", parameters={"capacitance": 10e-12})
+        
+        # 数字后端
+        manager.create_component("DATA_FF", "flipflop", flip_flop_type="JK")
+        manager.create_component("ADDR_CNT", "counter", width=16, count_up=True)
     
     # 获取系统信息
     system_info = manager.get_system_info()
@@ -243,13 +226,8 @@ def demo_system_analysis():
     print("--- 系统组件统计 ---")
     print(f"总组件数: {len(system_info['components'])}")
     
-    # 按类型分类
-    type_counts = {}
-    for comp_info in system_info['components'].values():
-        comp_type = comp_info['type']
-        type_counts[comp_type] = type_counts.get(comp_type, 0) + 1
-    
-    for comp_type, count in type_counts.items():
+    # 按类型分类（管理器增量维护的统计）
+    for comp_type, count in manager.type_counts.items():
         print(f"  - {comp_type}: {count} 个")
     
     print(f"\n--- 数据库统计 ---")
@@ -260,8 +238,6 @@ def demo_system_analysis():
     # 导出设计
     manager.export_design("demo_design.json")
     print("\n✓ 设计已导出到 demo_design.json")
-    
-    manager.close()
 
 def demo_convenience_functions():
     """演示便捷函数"""
@@ -285,12 +261,17 @@ def main():
     print("=== 灵活组件接口系统演示 ===")
     print("展示统一的ComponentManager管理数据库组件和逻辑电路")
     
-    demo_component_information()
-    demo_parameter_modification()
-    demo_component_connections()
-    demo_logic_simulation()
-    demo_module_creation()
-    demo_system_analysis()
+    # 所有演示共用一个管理器和数据库连接，结束时统一关闭
+    manager = ComponentManager("demo_interface.db")
+    try:
+        demo_component_information(manager)
+        demo_parameter_modification(manager)
+        demo_component_connections(manager)
+        demo_logic_simulation(manager)
+        demo_module_creation(manager)
+        demo_system_analysis(manager)
+    finally:
+        manager.close()
     demo_convenience_functions()
     
     print("\n=== 演示完成 ===")
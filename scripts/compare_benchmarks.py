@@ -6,11 +6,34 @@ Compares benchmark results between different runs and generates performance regr
 
 import json
 import argparse
+import mmap
+import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, NamedTuple
 import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson is an optional speed-up; its decode errors subclass json.JSONDecodeError
+json_loads = orjson.loads if orjson is not None else json.loads
+
+NS_PER_MS = 1_000_000
+
+# orjson parses a memoryview in place, so files above this size are mapped
+# rather than read into an intermediate bytes copy
+MMAP_THRESHOLD = 64 * 1024
+
+class BenchmarkMetric(NamedTuple):
+    """Key metrics of a single benchmark entry."""
+    time_ns: float
+    time_ms: float
+    iterations: int
+    items_per_second: float
+
 class BenchmarkComparator:
     def __init__(self, tolerance: float = 0.05):
         """
@@ -24,13 +47,17 @@ class BenchmarkComparator:
     def load_benchmark_results(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Load benchmark results from JSON file."""
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                if orjson is None or os.fstat(f.fileno()).st_size <= MMAP_THRESHOLD:
+                    return json_loads(f.read())
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        return orjson.loads(view)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Failed to load benchmark results from {file_path}: {e}")
             return None
     
-    def extract_benchmark_metrics(self, results: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    def extract_benchmark_metrics(self, results: Dict[str, Any]) -> Dict[str, Dict[str, BenchmarkMetric]]:
         """Extract key metrics from benchmark results."""
         metrics = {}
         
@@ -38,23 +65,25 @@ class BenchmarkComparator:
             if benchmark_data is None:
                 continue
                 
-            benchmark_metrics = {}
-            
-            for bench in benchmark_data.get('benchmarks', []):
-                bench_name = bench.get('name', 'unknown')
-                benchmark_metrics[bench_name] = {
-                    'time_ns': bench.get('time_ns', 0),
-                    'time_ms': bench.get('time_ms', 0),
-                    'iterations': bench.get('iterations', 0),
-                    'items_per_second': bench.get('items_per_second', 0)
-                }
+            try:
+                benches = benchmark_data['benchmarks']
+            except KeyError:
+                benches = ()
             
-            metrics[benchmark_name] = benchmark_metrics
+            metrics[benchmark_name] = {
+                bench.get('name', 'unknown'): BenchmarkMetric(
+                    bench.get('time_ns', 0),
+                    bench.get('time_ms', 0),
+                    bench.get('iterations', 0),
+                    bench.get('items_per_second', 0)
+                )
+                for bench in benches
+            }
         
         return metrics
     
-    def compare_benchmark_metrics(self, baseline: Dict[str, Dict[str, Any]], 
-                                  current: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    def compare_benchmark_metrics(self, baseline: Dict[str, Dict[str, BenchmarkMetric]], 
+                                  current: Dict[str, Dict[str, BenchmarkMetric]]) -> Dict[str, Any]:
         """Compare benchmark metrics and identify regressions/improvements."""
         comparison = {
             'summary': {
@@ -67,75 +96,82 @@ class BenchmarkComparator:
             },
             'detailed_results': {},
             'regressions': [],
-            'improvements': []
+            'improvements': [],
+            'new_benchmarks': [],
+            'removed_benchmarks': []
         }
         
-        # Get all unique benchmark names
-        all_benchmarks = set()
-        for benchmark_group in [baseline, current]:
-            for benchmark_name in benchmark_group:
-                for bench_name in benchmark_group[benchmark_name]:
-                    all_benchmarks.add((benchmark_name, bench_name))
+        tolerance = self.tolerance
+        summary = comparison['summary']
+        detailed_results = comparison['detailed_results']
         
-        comparison['summary']['total_benchmarks'] = len(all_benchmarks)
-        
-        for benchmark_name, bench_name in all_benchmarks:
-            baseline_exists = (benchmark_name in baseline and 
-                             bench_name in baseline[benchmark_name])
-            current_exists = (benchmark_name in current and 
-                            bench_name in current[benchmark_name])
+        # Walk the union of groups and benchmark names once, in first-seen
+        # order, looking each record up a single time per side
+        for benchmark_name in dict.fromkeys([*baseline, *current]):
+            baseline_group = baseline.get(benchmark_name, {})
+            current_group = current.get(benchmark_name, {})
             
-            if baseline_exists and current_exists:
-                # Compare existing benchmarks
-                baseline_time = baseline[benchmark_name][bench_name]['time_ns']
-                current_time = current[benchmark_name][bench_name]['time_ns']
+            for bench_name in dict.fromkeys([*baseline_group, *current_group]):
+                summary['total_benchmarks'] += 1
+                baseline_record = baseline_group.get(bench_name)
+                current_record = current_group.get(bench_name)
+                key = f"{benchmark_name}::{bench_name}"
                 
-                if baseline_time > 0:
-                    change_ratio = (current_time - baseline_time) / baseline_time
-                    change_percent = change_ratio * 100
+                if baseline_record is not None and current_record is not None:
+                    # Compare existing benchmarks
+                    baseline_time = baseline_record.time_ns
+                    current_time = current_record.time_ns
+                    
+                    if baseline_time > 0:
+                        change_ratio = (current_time - baseline_time) / baseline_time
+                        change_percent = change_ratio * 100
+                        
+                        result = {
+                            'benchmark_group': benchmark_name,
+                            'benchmark_name': bench_name,
+                            'baseline_time_ns': baseline_time,
+                            'current_time_ns': current_time,
+                            'change_ratio': change_ratio,
+                            'change_percent': change_percent,
+                            'status': 'unchanged'
+                        }
+                        
+                        if change_ratio > tolerance:
+                            result['status'] = 'regressed'
+                            summary['regressed'] += 1
+                            comparison['regressions'].append(result)
+                        elif change_ratio < -tolerance:
+                            result['status'] = 'improved'
+                            summary['improved'] += 1
+                            comparison['improvements'].append(result)
+                        else:
+                            summary['unchanged'] += 1
+                        
+                        detailed_results[key] = result
                     
+                elif current_record is not None:
+                    # New benchmark
+                    summary['new_benchmarks'] += 1
                     result = {
                         'benchmark_group': benchmark_name,
                         'benchmark_name': bench_name,
-                        'baseline_time_ns': baseline_time,
-                        'current_time_ns': current_time,
-                        'change_ratio': change_ratio,
-                        'change_percent': change_percent,
-                        'status': 'unchanged'
+                        'current_time_ns': current_record.time_ns,
+                        'status': 'new'
                     }
+                    comparison['new_benchmarks'].append(result)
+                    detailed_results[key] = result
                     
-                    if change_ratio > self.tolerance:
-                        result['status'] = 'regressed'
-                        comparison['summary']['regressed'] += 1
-                        comparison['regressions'].append(result)
-                    elif change_ratio < -self.tolerance:
-                        result['status'] = 'improved'
-                        comparison['summary']['improved'] += 1
-                        comparison['improvements'].append(result)
-                    else:
-                        comparison['summary']['unchanged'] += 1
-                    
-                    comparison['detailed_results'][f"{benchmark_name}::{bench_name}"] = result
-                
-            elif not baseline_exists and current_exists:
-                # New benchmark
-                comparison['summary']['new_benchmarks'] += 1
-                comparison['detailed_results'][f"{benchmark_name}::{bench_name}"] = {
-                    'benchmark_group': benchmark_name,
-                    'benchmark_name': bench_name,
-                    'current_time_ns': current[benchmark_name][bench_name]['time_ns'],
-                    'status': 'new'
-                }
-                
-            elif baseline_exists and not current_exists:
-                # Removed benchmark
-                comparison['summary']['removed_benchmarks'] += 1
-                comparison['detailed_results'][f"{benchmark_name}::{bench_name}"] = {
-                    'benchmark_group': benchmark_name,
-                    'benchmark_name': bench_name,
-                    'baseline_time_ns': baseline[benchmark_name][bench_name]['time_ns'],
-                    'status': 'removed'
-                }
+                else:
+                    # Removed benchmark
+                    summary['removed_benchmarks'] += 1
+                    result = {
+                        'benchmark_group': benchmark_name,
+                        'benchmark_name': bench_name,
+                        'baseline_time_ns': baseline_record.time_ns,
+                        'status': 'removed'
+                    }
+                    comparison['removed_benchmarks'].append(result)
+                    detailed_results[key] = result
         
         return comparison
     
@@ -172,16 +208,11 @@ class BenchmarkComparator:
                 "|-----------|----------|---------|--------|"
             ])
             
-            for regression in comparison['regressions']:
-                baseline_ms = regression['baseline_time_ns'] / 1_000_000
-                current_ms = regression['current_time_ns'] / 1_000_000
-                change_str = f"+{regression['change_percent']:.1f}%"
-                
-                lines.append(
-                    f"| {regression['benchmark_name']} | {baseline_ms:.3f}ms | "
-                    f"{current_ms:.3f}ms | {change_str} |"
-                )
-            
+            lines.extend(
+                f"| {regression['benchmark_name']} | {regression['baseline_time_ns'] / NS_PER_MS:.3f}ms | "
+                f"{regression['current_time_ns'] / NS_PER_MS:.3f}ms | +{regression['change_percent']:.1f}% |"
+                for regression in comparison['regressions']
+            )
             lines.append("")
         
         if comparison['summary']['improved'] > 0:
@@ -194,16 +225,11 @@ class BenchmarkComparator:
                 "|-----------|----------|---------|--------|"
             ])
             
-            for improvement in comparison['improvements']:
-                baseline_ms = improvement['baseline_time_ns'] / 1_000_000
-                current_ms = improvement['current_time_ns'] / 1_000_000
-                change_str = f"{improvement['change_percent']:.1f}%"
-                
-                lines.append(
-                    f"| {improvement['benchmark_name']} | {baseline_ms:.3f}ms | "
-                    f"{current_ms:.3f}ms | {change_str} |"
-                )
-            
+            lines.extend(
+                f"| {improvement['benchmark_name']} | {improvement['baseline_time_ns'] / NS_PER_MS:.3f}ms | "
+                f"{improvement['current_time_ns'] / NS_PER_MS:.3f}ms | {improvement['change_percent']:.1f}% |"
+                for improvement in comparison['improvements']
+            )
             lines.append("")
         
         if comparison['summary']['new_benchmarks'] > 0:
@@ -214,11 +240,10 @@ class BenchmarkComparator:
                 "|-----------|------|"
             ])
             
-            for result in comparison['detailed_results'].values():
-                if result['status'] == 'new':
-                    current_ms = result['current_time_ns'] / 1_000_000
-                    lines.append(f"| {result['benchmark_name']} | {current_ms:.3f}ms |")
-            
+            lines.extend(
+                f"| {result['benchmark_name']} | {result['current_time_ns'] / NS_PER_MS:.3f}ms |"
+                for result in comparison['new_benchmarks']
+            )
             lines.append("")
         
         if comparison['summary']['removed_benchmarks'] > 0:
@@ -229,11 +254,10 @@ class BenchmarkComparator:
                 "|-----------|---------------|"
             ])
             
-            for result in comparison['detailed_results'].values():
-                if result['status'] == 'removed':
-                    baseline_ms = result['baseline_time_ns'] / 1_000_000
-                    lines.append(f"| {result['benchmark_name']} | {baseline_ms:.3f}ms |")
-            
+            lines.extend(
+                f"| {result['benchmark_name']} | {result['baseline_time_ns'] / NS_PER_MS:.3f}ms |"
+                for result in comparison['removed_benchmarks']
+            )
             lines.append("")
         
         # Overall assessment
@@ -276,37 +300,48 @@ class BenchmarkComparator:
         
         return success, report
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line parser for the comparison script."""
     parser = argparse.ArgumentParser(description='Compare ZLayout benchmark results')
     parser.add_argument('baseline', help='Path to baseline benchmark results (JSON)')
     parser.add_argument('current', help='Path to current benchmark results (JSON)')
     parser.add_argument('--tolerance', type=float, default=0.05, 
-                       help='Performance regression tolerance (default: 0.05 = 5%)')
+                       help='Performance regression tolerance (default: 0.05 = 5%%)')
     parser.add_argument('--output', help='Output file for comparison report')
     parser.add_argument('--fail-on-regression', action='store_true',
                        help='Exit with error code if regressions are detected')
+    return parser
+
+def main(args: Optional[argparse.Namespace] = None) -> int:
+    """
+    Compare two result files and report regressions.
+    
+    Args:
+        args: Parsed options with the attributes defined by build_parser();
+              the command line is parsed when omitted
     
-    args = parser.parse_args()
+    Returns:
+        Process exit code
+    """
+    if args is None:
+        args = build_parser().parse_args()
     
     comparator = BenchmarkComparator(args.tolerance)
     success, report = comparator.compare_benchmark_files(args.baseline, args.current)
     
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(report)
+        Path(args.output).write_text(report, encoding='utf-8')
         print(f"Comparison report saved to: {args.output}")
     else:
         print(report)
     
     if args.fail_on_regression and not success:
         print("\n❌ Performance regressions detected!", file=sys.stderr)
-        sys.exit(1)
+        return 1
     
     if success:
         print("\n✅ No performance regressions detected!")
-        sys.exit(0)
-    else:
-        sys.exit(0)  # Don't fail by default, just report
+    return 0  # Don't fail by default, just report
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -10,10 +10,54 @@ import json
 import subprocess
 import argparse
 import datetime
+import functools
+import hashlib
 import platform
+import re
 import shutil
+import string
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson is an optional speed-up; its decode errors subclass json.JSONDecodeError
+json_loads = orjson.loads if orjson is not None else json.loads
+
+SYSTEM_INFO_SECTION_RE = re.compile(
+    r'\*\*Test System Specifications:\*\*.*?\*\*ZLayout Version\*\*: [^\n]*',
+    re.DOTALL
+)
+
+NS_PER_MS = 1_000_000
+
+SYSTEM_INFO_TEMPLATE = string.Template("""**Test System Specifications:**
+- **CPU**: $processor
+- **Platform**: $platform
+- **Architecture**: $architecture
+- **Python**: $python_version
+- **Last Updated**: $timestamp
+- **ZLayout Version**: 1.0.0""")
+
+BENCHMARK_CONFIG_ARGS = ('--with-benchmarks=true', '--mode=release', '--optimization=fastest')
+
+@functools.lru_cache(maxsize=None)
+def _host_info() -> Tuple[Tuple[str, Any], ...]:
+    """Platform details that cannot change within a process.
+
+    platform.architecture() and platform.processor() may spawn 'file' or
+    'uname', so they are queried once per process.
+    """
+    return (
+        ('platform', platform.platform()),
+        ('processor', platform.processor()),
+        ('architecture', platform.architecture()),
+        ('python_version', platform.python_version()),
+    )
 
 class BenchmarkRunner:
     def __init__(self, build_dir: str = "build", output_dir: str = "benchmark_results"):
@@ -23,13 +67,7 @@ class BenchmarkRunner:
         self.timestamp = datetime.datetime.now().isoformat()
         
         # System information
-        self.system_info = {
-            'platform': platform.platform(),
-            'processor': platform.processor(),
-            'architecture': platform.architecture(),
-            'python_version': platform.python_version(),
-            'timestamp': self.timestamp
-        }
+        self.system_info = dict(_host_info(), timestamp=self.timestamp)
     
     def check_dependencies(self) -> bool:
         """Check if all required tools are available."""
@@ -42,25 +80,40 @@ class BenchmarkRunner:
         
         return True
     
+    @staticmethod
+    def _config_stamp() -> str:
+        """Fingerprint of the benchmark configuration and xmake's saved state."""
+        digest = hashlib.sha256(' '.join(BENCHMARK_CONFIG_ARGS).encode())
+        xmake_lua = Path('xmake.lua')
+        if xmake_lua.exists():
+            digest.update(xmake_lua.read_bytes())
+        # Any later 'xmake config' (e.g. a manual debug configure) rewrites
+        # xmake.conf and so invalidates the stamp
+        for conf in sorted(Path('.xmake').glob('**/xmake.conf')):
+            digest.update(f"{conf}:{conf.stat().st_mtime_ns}".encode())
+        return digest.hexdigest()
+    
     def build_benchmarks(self) -> bool:
         """Build the benchmark executables."""
         print("Building benchmarks...")
         
         try:
-            # Configure with benchmarks enabled
-            subprocess.run([
-                'xmake', 'config', 
-                '--with-benchmarks=true',
-                '--mode=release',
-                '--optimization=fastest'
-            ], check=True, capture_output=True)
+            # Configure with benchmarks enabled, unless this exact
+            # configuration is still the active one
+            config_stamp = self._config_stamp()
+            stamp_file = self.build_dir / '.bench_config_stamp'
+            if not stamp_file.exists() or stamp_file.read_text() != config_stamp:
+                subprocess.run(['xmake', 'config', *BENCHMARK_CONFIG_ARGS],
+                               check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                self.build_dir.mkdir(parents=True, exist_ok=True)
+                stamp_file.write_text(self._config_stamp())
             
             # Build benchmark targets
             subprocess.run([
                 'xmake', 'build', 
                 'bench_geometry',
                 'bench_quadtree'
-            ], check=True, capture_output=True)
+            ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             
             return True
             
@@ -73,41 +126,51 @@ class BenchmarkRunner:
         print(f"Running {executable}...")
         
         try:
-            # Run benchmark with JSON output
-            result = subprocess.run([
+            # Run benchmark with JSON output; results land in output_file, so
+            # the console report is discarded and only stderr is kept
+            subprocess.run([
                 'xmake', 'run', executable,
                 '--benchmark_out=' + output_file,
                 '--benchmark_out_format=json',
                 '--benchmark_repetitions=3',
                 '--benchmark_report_aggregates_only=true'
-            ], check=True, capture_output=True, text=True)
+            ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
             
             print(f"Benchmark {executable} completed successfully")
             return True
             
         except subprocess.CalledProcessError as e:
             print(f"Benchmark {executable} failed: {e}")
-            print(f"stdout: {e.stdout}")
-            print(f"stderr: {e.stderr}")
+            print(f"stderr: {e.stderr.decode('utf-8', errors='replace')}")
             return False
     
-    def run_all_benchmarks(self) -> Dict[str, Any]:
-        """Run all benchmark executables and collect results."""
+    def run_all_benchmarks(self, parallel: bool = False) -> Dict[str, Any]:
+        """Run all benchmark executables and collect results.
+        
+        With parallel=True the executables run concurrently, one thread
+        each waiting on its own process.
+        """
         benchmark_results = {}
         
         benchmarks = [
             ('bench_geometry', 'geometry_results.json'),
             ('bench_quadtree', 'quadtree_results.json')
         ]
+        names = [benchmark_name for benchmark_name, _ in benchmarks]
+        output_paths = [self.output_dir / output_file for _, output_file in benchmarks]
         
-        for benchmark_name, output_file in benchmarks:
-            output_path = self.output_dir / output_file
-            
-            if self.run_benchmark_executable(benchmark_name, str(output_path)):
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(benchmarks)) as executor:
+                succeeded = list(executor.map(self.run_benchmark_executable,
+                                              names, map(str, output_paths)))
+        else:
+            succeeded = [self.run_benchmark_executable(name, str(path))
+                         for name, path in zip(names, output_paths)]
+        
+        for benchmark_name, output_path, ok in zip(names, output_paths, succeeded):
+            if ok:
                 try:
-                    with open(output_path, 'r') as f:
-                        results = json.load(f)
-                        benchmark_results[benchmark_name] = results
+                    benchmark_results[benchmark_name] = json_loads(output_path.read_bytes())
                 except json.JSONDecodeError as e:
                     print(f"Failed to parse results for {benchmark_name}: {e}")
                     benchmark_results[benchmark_name] = None
@@ -128,37 +191,33 @@ class BenchmarkRunner:
             if result_data is None:
                 continue
                 
+            benchmarks = result_data.get('benchmarks', ())
             benchmark_summary = {
-                'total_benchmarks': len(result_data.get('benchmarks', [])),
+                'total_benchmarks': len(benchmarks),
                 'fastest_benchmark': None,
                 'slowest_benchmark': None,
                 'average_time': 0,
-                'benchmarks': []
-            }
-            
-            benchmarks = result_data.get('benchmarks', [])
-            if benchmarks:
-                times = []
-                for bench in benchmarks:
-                    time_ns = bench.get('real_time', 0)
-                    times.append(time_ns)
-                    
-                    benchmark_summary['benchmarks'].append({
+                'benchmarks': [
+                    {
                         'name': bench.get('name', 'unknown'),
-                        'time_ns': time_ns,
-                        'time_ms': time_ns / 1_000_000,
+                        'time_ns': bench.get('real_time', 0),
+                        'time_ms': bench.get('real_time', 0) / NS_PER_MS,
                         'iterations': bench.get('iterations', 0),
                         'bytes_per_second': bench.get('bytes_per_second', 0),
                         'items_per_second': bench.get('items_per_second', 0)
-                    })
+                    }
+                    for bench in benchmarks
+                ]
+            }
+            
+            if benchmarks:
+                times = [entry['time_ns'] for entry in benchmark_summary['benchmarks']]
+                fastest_idx = min(range(len(times)), key=times.__getitem__)
+                slowest_idx = max(range(len(times)), key=times.__getitem__)
                 
-                if times:
-                    fastest_idx = times.index(min(times))
-                    slowest_idx = times.index(max(times))
-                    
-                    benchmark_summary['fastest_benchmark'] = benchmarks[fastest_idx]['name']
-                    benchmark_summary['slowest_benchmark'] = benchmarks[slowest_idx]['name']
-                    benchmark_summary['average_time'] = sum(times) / len(times)
+                benchmark_summary['fastest_benchmark'] = benchmarks[fastest_idx]['name']
+                benchmark_summary['slowest_benchmark'] = benchmarks[slowest_idx]['name']
+                benchmark_summary['average_time'] = sum(times) / len(times)
             
             summary['benchmark_results'][benchmark_name] = benchmark_summary
         
@@ -184,21 +243,17 @@ class BenchmarkRunner:
                 f"- **Total Benchmarks**: {benchmark_data['total_benchmarks']}",
                 f"- **Fastest**: {benchmark_data['fastest_benchmark']}",
                 f"- **Slowest**: {benchmark_data['slowest_benchmark']}",
-                f"- **Average Time**: {benchmark_data['average_time'] / 1_000_000:.2f} ms",
+                f"- **Average Time**: {benchmark_data['average_time'] / NS_PER_MS:.2f} ms",
                 "",
                 "| Benchmark | Time (ms) | Iterations | Items/sec |",
                 "|-----------|-----------|------------|-----------|"
             ])
             
-            for bench in benchmark_data['benchmarks']:
-                items_per_sec = bench['items_per_second']
-                items_per_sec_str = f"{items_per_sec:.2e}" if items_per_sec > 0 else "N/A"
-                
-                lines.append(
-                    f"| {bench['name']} | {bench['time_ms']:.3f} | "
-                    f"{bench['iterations']:,} | {items_per_sec_str} |"
-                )
-            
+            lines.extend(
+                f"| {bench['name']} | {bench['time_ms']:.3f} | {bench['iterations']:,} | "
+                f"{format(bench['items_per_second'], '.2e') if bench['items_per_second'] > 0 else 'N/A'} |"
+                for bench in benchmark_data['benchmarks']
+            )
             lines.append("")
         
         return "\n".join(lines)
@@ -210,41 +265,29 @@ class BenchmarkRunner:
         
         if benchmark_results_file.exists():
             # Read existing file and update the timestamp and system info
-            with open(benchmark_results_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = benchmark_results_file.read_text(encoding='utf-8')
             
             # Update system info section
-            system_info_section = f"""**Test System Specifications:**
-- **CPU**: {summary['system_info']['processor']}
-- **Platform**: {summary['system_info']['platform']}
-- **Architecture**: {summary['system_info']['architecture'][0]}
-- **Python**: {summary['system_info']['python_version']}
-- **Last Updated**: {summary['system_info']['timestamp']}
-- **ZLayout Version**: 1.0.0"""
+            system_info = summary['system_info']
+            system_info_section = SYSTEM_INFO_TEMPLATE.substitute(
+                system_info, architecture=system_info['architecture'][0])
             
-            # Replace the system info section
-            import re
-            content = re.sub(
-                r'\*\*Test System Specifications:\*\*.*?\*\*ZLayout Version\*\*: [^\n]*',
-                system_info_section,
-                content,
-                flags=re.DOTALL
-            )
+            # Replace the system info section (a callable replacement keeps
+            # backslashes in platform strings from being read as escapes)
+            content = SYSTEM_INFO_SECTION_RE.sub(lambda _: system_info_section, content)
             
-            with open(benchmark_results_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            benchmark_results_file.write_text(content, encoding='utf-8')
         
         # Create a timestamped report
         timestamp_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         timestamped_report = self.output_dir / f"benchmark_report_{timestamp_str}.md"
         
-        with open(timestamped_report, 'w', encoding='utf-8') as f:
-            f.write(markdown_report)
+        timestamped_report.write_text(markdown_report, encoding='utf-8')
         
         print(f"Documentation updated")
         print(f"Timestamped report saved to: {timestamped_report}")
     
-    def run_full_benchmark_suite(self) -> bool:
+    def run_full_benchmark_suite(self, parallel: bool = False) -> bool:
         """Run the complete benchmark suite and generate reports."""
         print("Starting ZLayout benchmark suite...")
         
@@ -254,7 +297,7 @@ class BenchmarkRunner:
         if not self.build_benchmarks():
             return False
         
-        results = self.run_all_benchmarks()
+        results = self.run_all_benchmarks(parallel=parallel)
         
         if not any(results.values()):
             print("No benchmark results collected")
@@ -265,12 +308,16 @@ class BenchmarkRunner:
         
         # Save results
         summary_file = self.output_dir / "benchmark_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        # Serialize in one call and write once; json.dump would push every
+        # token through a separate file write
+        if orjson is not None:
+            summary_bytes = orjson.dumps(summary, option=orjson.OPT_INDENT_2)
+        else:
+            summary_bytes = json.dumps(summary, indent=2).encode('utf-8')
+        summary_file.write_bytes(summary_bytes)
         
         report_file = self.output_dir / "benchmark_report.md"
-        with open(report_file, 'w') as f:
-            f.write(markdown_report)
+        report_file.write_text(markdown_report, encoding='utf-8')
         
         self.update_documentation(summary, markdown_report)
         
@@ -281,20 +328,34 @@ class BenchmarkRunner:
         
         return True
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line parser for the benchmark runner."""
     parser = argparse.ArgumentParser(description='Run ZLayout benchmarks and generate reports')
     parser.add_argument('--build-dir', default='build', help='Build directory')
     parser.add_argument('--output-dir', default='benchmark_results', help='Output directory for results')
     parser.add_argument('--update-docs', action='store_true', help='Update documentation with results')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run benchmark executables concurrently (faster, but they compete '
+                             'for shared cache and memory bandwidth, which adds timing noise)')
+    return parser
+
+def main(args: Optional[argparse.Namespace] = None) -> int:
+    """
+    Run the benchmark suite.
+    
+    Args:
+        args: Parsed options with the attributes defined by build_parser();
+              the command line is parsed when omitted
     
-    args = parser.parse_args()
+    Returns:
+        Process exit code
+    """
+    if args is None:
+        args = build_parser().parse_args()
     
     runner = BenchmarkRunner(args.build_dir, args.output_dir)
     
-    if runner.run_full_benchmark_suite():
-        sys.exit(0)
-    else:
-        sys.exit(1)
+    return 0 if runner.run_full_benchmark_suite(parallel=args.parallel) else 1
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main())
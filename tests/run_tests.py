@@ -5,14 +5,39 @@ Test runner for ZLayout library.
 
 import sys
 import os
+import subprocess
 import unittest
+import importlib.util
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 
 def run_all_tests():
-    """Run all unit tests for ZLayout."""
+    """Run all unit tests for ZLayout.
+    
+    Test files run in parallel worker processes when pytest-xdist is
+    installed, and serially through unittest otherwise.
+    """
+    if importlib.util.find_spec("xdist") is not None:
+        return run_parallel_tests()
+    return run_serial_tests()
+
+
+def run_parallel_tests():
+    """Run the test files on pytest-xdist workers, one file per worker."""
+    workers = "auto"
+    if os.environ.get("CI") == "true":
+        # Leave two cores for the runner itself and the rest of the job
+        workers = str(max(1, (os.cpu_count() or 1) - 2))
+    
+    command = [sys.executable, "-m", "pytest", "-n", workers, "--dist=loadfile",
+               os.path.dirname(os.path.abspath(__file__))]
+    return subprocess.call(command)
+
+
+def run_serial_tests():
+    """Run the unittest suite in this process."""
     
     # Discover and run tests
     loader = unittest.TestLoader()
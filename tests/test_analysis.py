@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Unit tests for zlayout.analysis module.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from zlayout.geometry import Point, Rectangle, Polygon
+from zlayout import analysis
+from zlayout.analysis import PolygonAnalyzer, GeometryProcessor
+
+
+class TestSharpAngleAnalysis(unittest.TestCase):
+    """Test cases for sharp angle analysis."""
+
+    def setUp(self):
+        self.triangle = Polygon([Point(0, 0), Point(10, 0), Point(1, 2)])
+        self.square = Polygon([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)])
+        self.right_triangle = Polygon([Point(0, 0), Point(1, 0), Point(0, 1)])
+
+    def _analyze(self, polygons, threshold, vectorized):
+        analyzer = PolygonAnalyzer()
+        for polygon in polygons:
+            analyzer.add_polygon(polygon)
+
+        saved = analysis.HAS_NUMPY
+        analysis.HAS_NUMPY = saved and vectorized
+        try:
+            return analyzer.find_sharp_angles(threshold)
+        finally:
+            analysis.HAS_NUMPY = saved
+
+    def test_vectorized_matches_scalar(self):
+        """Test that the NumPy path reports the same vertices as the scalar path."""
+        if not analysis.HAS_NUMPY:
+            self.skipTest("numpy not available")
+
+        polygons = [self.triangle, self.square, self.right_triangle]
+        for threshold in (10, 30, 44.999, 46, 60, 89, 91):
+            vectorized = self._analyze(polygons, threshold, True)
+            scalar = self._analyze(polygons, threshold, False)
+
+            self.assertEqual([(p, v) for p, v, _ in vectorized.sharp_angles],
+                             [(p, v) for p, v, _ in scalar.sharp_angles])
+            for (_, _, a1), (_, _, a2) in zip(vectorized.sharp_angles, scalar.sharp_angles):
+                self.assertAlmostEqual(a1, a2, places=6)
+            self.assertAlmostEqual(vectorized.sharpest_angle, scalar.sharpest_angle, places=6)
+            self.assertAlmostEqual(vectorized.average_angle, scalar.average_angle, places=6)
+
+    def test_angle_kernel_matches_numpy(self):
+        """Test that the fused vertex-angle kernel agrees with the NumPy expression."""
+        if not analysis.HAS_NUMPY:
+            self.skipTest("numpy not available")
+
+        analyzer = PolygonAnalyzer()
+        analyzer.add_polygons([self.triangle, self.square,
+                               Polygon([Point(0, 0), Point(2, 0), Point(2, 0), Point(1, 3)])])
+        saved = analysis.HAS_NUMBA
+        try:
+            results = []
+            for use_kernel in (True, False):
+                analysis.HAS_NUMBA = use_kernel
+                results.append(analyzer.compute_vertex_angles())
+        finally:
+            analysis.HAS_NUMBA = saved
+
+        kernel, numpy_path = results
+        self.assertEqual(kernel['vertex_indices'].tolist(), numpy_path['vertex_indices'].tolist())
+        for a1, a2 in zip(kernel['angles'].tolist(), numpy_path['angles'].tolist()):
+            self.assertAlmostEqual(a1, a2, places=9)
+
+    def test_add_polygons_batch(self):
+        """Test that batch insertion matches adding polygons one by one."""
+        polygons = [self.triangle, self.square, self.right_triangle]
+        batch = PolygonAnalyzer()
+        self.assertEqual(batch.add_polygons(polygons[:2]), [0, 1])
+        self.assertEqual(batch.add_polygons(polygons[2:]), [2])
+
+        single = PolygonAnalyzer()
+        for polygon in polygons:
+            single.add_polygon(polygon)
+        self.assertEqual(batch.find_sharp_angles(45).sharp_angles,
+                         single.find_sharp_angles(45).sharp_angles)
+
+    def test_vertex_buffer_tracks_new_polygons(self):
+        """Test that adding polygons after an analysis is picked up."""
+        processor = GeometryProcessor(Rectangle(-10, -10, 40, 40))
+        processor.add_component(self.square)
+        self.assertEqual(processor.analyze_layout(sharp_angle_threshold=30)['sharp_angles']['count'], 0)
+
+        processor.add_component(self.triangle)
+        sharp = processor.analyze_layout(sharp_angle_threshold=30)['sharp_angles']
+        self.assertGreater(sharp['count'], 0)
+        self.assertLess(sharp['sharpest'], 30)
+
+    def test_vertex_buffer_tracks_replaced_polygons(self):
+        """Test that reassigning a polygon slot invalidates the vertex buffer."""
+        analyzer = PolygonAnalyzer()
+        analyzer.add_polygon(self.triangle)
+        self.assertEqual(len(analyzer.find_sharp_angles(30).sharp_angles), 1)
+
+        analyzer.polygons[0] = self.square
+        self.assertEqual(len(analyzer.find_sharp_angles(30).sharp_angles), 0)
+
+
+class TestEdgeDistanceAnalysis(unittest.TestCase):
+    """Test cases for edge distance analysis."""
+
+    def test_vectorized_matches_scalar(self):
+        """Test that the NumPy path reports the same distances and pairs as the scalar path."""
+        if not analysis.HAS_NUMPY:
+            self.skipTest("numpy not available")
+
+        analyzer = PolygonAnalyzer()
+        for polygon in ([Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)],
+                        [Point(5, 1), Point(9, 2), Point(6, 6)],
+                        [Point(1, 5), Point(3, 5), Point(3, 5), Point(2, 9), Point(0, 7)]):
+            analyzer.add_polygon(Polygon(polygon))
+
+        vectorized = analyzer.compute_edge_distances()
+        saved = analysis.HAS_NUMPY
+        analysis.HAS_NUMPY = False
+        try:
+            scalar = analyzer.compute_edge_distances()
+        finally:
+            analysis.HAS_NUMPY = saved
+
+        self.assertEqual(vectorized['distances'].tolist(), scalar['distances'])
+        for k in range(len(scalar['distances'])):
+            self.assertEqual(analyzer.edge_pair_points(vectorized, k), scalar['edge_pairs'][k])
+
+    def test_cutoff_keeps_narrow_regions(self):
+        """Test that a distance cutoff drops only pairs beyond the cutoff."""
+        polygons = [Polygon([Point(x, y), Point(x + 3, y), Point(x + 3, y + 3), Point(x, y + 3)])
+                    for x, y in ((0, 0), (4, 0), (4, 4.5), (20, 20), (40, 0))]
+        processor = GeometryProcessor(Rectangle(-10, -10, 100, 100))
+        processor.add_components(polygons)
+        analyzer = PolygonAnalyzer()
+        for polygon in polygons:
+            analyzer.add_polygon(polygon)
+
+        saved = analysis.HAS_NUMPY
+        for vectorized in (True, False):
+            analysis.HAS_NUMPY = saved and vectorized
+            try:
+                for owner in (processor.analyzer, analyzer):
+                    full = owner.compute_edge_distances()
+                    cut = owner.compute_edge_distances(max_distance=2.0)
+                    self.assertLess(len(cut['distances']), len(full['distances']))
+                    for threshold in (0.5, 1.0, 2.0):
+                        expected = owner.threshold_narrow_distances(full, threshold)
+                        actual = owner.threshold_narrow_distances(cut, threshold)
+                        self.assertEqual(actual.narrow_regions, expected.narrow_regions)
+                        self.assertEqual(actual.min_distance, expected.min_distance)
+            finally:
+                analysis.HAS_NUMPY = saved
+
+
+class TestGeometryProcessor(unittest.TestCase):
+    """Test cases for GeometryProcessor analysis."""
+
+    def setUp(self):
+        self.processor = GeometryProcessor(Rectangle(0, 0, 100, 100))
+        self.processor.add_components([
+            Polygon([Point(10, 10), Point(30, 12), Point(12, 16)]),
+            Polygon([Point(10, 17), Point(30, 17), Point(30, 25), Point(10, 25)]),
+            Polygon([Point(25, 20), Point(40, 20), Point(40, 30), Point(25, 30)]),
+        ])
+
+    def test_raw_analysis_reuse(self):
+        """Test that thresholding a raw block matches a fresh analysis."""
+        raw = self.processor.analyze_layout_raw()
+        for sharp, narrow in ((15, 0.5), (30, 1.0), (45, 3.0)):
+            fresh = self.processor.analyze_layout(sharp, narrow)
+            reused = self.processor.analyze_layout(sharp, narrow, raw=raw)
+            for key in ('sharp_angles', 'narrow_distances', 'intersections'):
+                self.assertEqual(fresh[key], reused[key])
+
+        self.assertEqual(self.processor.optimize_layout(raw=raw)['optimization_score'],
+                         self.processor.optimize_layout()['optimization_score'])
+
+    def test_add_component_from_array(self):
+        """Test that vertex arrays are adopted as polygons without copying."""
+        if not analysis.HAS_NUMPY:
+            self.skipTest("numpy not available")
+        import numpy as np
+
+        coords = np.array([[50, 50], [60, 50], [60, 60], [50, 60]], dtype=np.float64)
+        obj_id = self.processor.add_component(coords)
+        polygon = self.processor.spatial_index.objects[obj_id]
+        self.assertIsInstance(polygon, Polygon)
+        self.assertIs(polygon.to_numpy(), coords)
+
+        ids = self.processor.add_components([coords + 20, Rectangle(5, 5, 1, 1)])
+        self.assertIsInstance(self.processor.spatial_index.objects[ids[0]], Polygon)
+
+    def test_narrow_distance_threshold(self):
+        """Test that narrow regions grow with the distance threshold."""
+        raw = self.processor.analyze_layout_raw()
+        small = self.processor.analyze_layout(narrow_distance_threshold=0.5, raw=raw)
+        large = self.processor.analyze_layout(narrow_distance_threshold=3.0, raw=raw)
+        self.assertLessEqual(small['narrow_distances']['count'], large['narrow_distances']['count'])
+        self.assertGreater(large['narrow_distances']['count'], 0)
+        self.assertEqual(small['narrow_distances']['minimum'], large['narrow_distances']['minimum'])
+
+
+if __name__ == '__main__':
+    unittest.main()
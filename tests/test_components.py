@@ -4,6 +4,8 @@ Unit tests for zlayout component system.
 """
 
 import unittest
+import json
+import pickle
 import tempfile
 import os
 import sys
@@ -23,15 +25,28 @@ class TestComponentDatabase(unittest.TestCase):
     """Test cases for ComponentDatabase."""
     
     def setUp(self):
-        # Create temporary database file
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ComponentDatabase(self.temp_db.name)
+        # In-memory database, private to this test
+        self.db = ComponentDatabase(":memory:")
     
     def tearDown(self):
         self.db.close()
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+    
+    def test_file_database_persists(self):
+        """Test that components survive reopening an on-disk database."""
+        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_db.close()
+        try:
+            db = ComponentDatabase(temp_db.name)
+            component_id = db.create_custom_component("persist_r", {"resistance": 47})
+            db.close()
+            
+            db = ComponentDatabase(temp_db.name)
+            self.assertEqual(db.get_component(component_id).parameters, {"resistance": 47})
+            db.close()
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(temp_db.name + suffix):
+                    os.unlink(temp_db.name + suffix)
     
     def test_database_initialization(self):
         """Test database initialization and basic components."""
@@ -58,6 +73,36 @@ class TestComponentDatabase(unittest.TestCase):
             self.assertEqual(spec.name, "test_resistor")
             self.assertEqual(spec.parameters["resistance"], 1000)
     
+    def test_custom_component_dedup(self):
+        """Test that identical custom specs share one database row."""
+        first = self.db.create_custom_component("cap_100n", {"capacitance": 1e-7, "voltage": 16})
+        second = self.db.create_custom_component("cap_100n", {"voltage": 16, "capacitance": 1e-7})
+        other = self.db.create_custom_component("cap_100n", {"capacitance": 2.2e-7, "voltage": 16})
+        
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(self.db.search_components(name_pattern="cap_100n")), 2)
+    
+    def test_batch_commits_once(self):
+        """Test that batched inserts commit together and roll back together."""
+        with self.db.batch():
+            first = self.db.create_custom_component("batch_r1", {"resistance": 1})
+            with self.db.batch():
+                self.db.create_custom_component("batch_r2", {"resistance": 2})
+            self.assertTrue(self.db.conn.in_transaction)
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertIsNotNone(self.db.get_component(first))
+        
+        with self.assertRaises(RuntimeError):
+            with self.db.batch():
+                self.db.create_custom_component("batch_r3", {"resistance": 3})
+                raise RuntimeError("abort")
+        self.assertEqual(self.db.search_components(name_pattern="batch_r3"), [])
+        
+        # The rolled-back spec is inserted again rather than served from the cache
+        third = self.db.create_custom_component("batch_r3", {"resistance": 3})
+        self.assertIsNotNone(self.db.get_component(third))
+    
     def test_component_search(self):
         """Test component search functionality."""
         # Create a test component
@@ -117,6 +162,39 @@ class TestLogicCircuits(unittest.TestCase):
         self.assertEqual(ff.outputs["Q"].state, LogicState.HIGH)
         self.assertEqual(ff.outputs["Q_bar"].state, LogicState.LOW)
     
+    def test_flipflop_type_dispatch(self):
+        """Test JK and SR flip-flops through the pre-bound edge handler."""
+        jk = FlipFlop("jk_ff", "JK")
+        jk.enable_signal.set_state(LogicState.HIGH)
+        jk.inputs["J"].set_state(LogicState.HIGH)
+        jk.inputs["K"].set_state(LogicState.HIGH)
+        jk.on_clock_edge()
+        self.assertEqual(jk.outputs["Q"].state, LogicState.HIGH)
+        jk.on_clock_edge()
+        self.assertEqual(jk.outputs["Q"].state, LogicState.LOW)
+        
+        sr = FlipFlop("sr_ff", "SR")
+        sr.enable_signal.set_state(LogicState.HIGH)
+        sr.inputs["S"].set_state(LogicState.HIGH)
+        sr.inputs["R"].set_state(LogicState.LOW)
+        sr.on_clock_edge()
+        self.assertEqual(sr.outputs["Q"].state, LogicState.HIGH)
+    
+    def test_flipflop_pickle(self):
+        """Test that a pickled flip-flop keeps its state and edge handler."""
+        jk = FlipFlop("pickled_ff", "JK")
+        jk.enable_signal.set_state(LogicState.HIGH)
+        jk.inputs["J"].set_state(LogicState.HIGH)
+        jk.inputs["K"].set_state(LogicState.HIGH)
+        jk.on_clock_edge()
+        
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(jk, protocol))
+            self.assertEqual(restored.internal_state["Q"], LogicState.HIGH)
+            self.assertIs(restored._edge_handler.__self__, restored)
+            restored.on_clock_edge()
+            self.assertEqual(restored.outputs["Q"].state, LogicState.LOW)
+    
     def test_counter_creation(self):
         """Test Counter creation and basic operations."""
         counter = Counter("test_counter", width=4, count_up=True)
@@ -138,6 +216,39 @@ class TestLogicCircuits(unittest.TestCase):
         
         counter.on_clock_edge()
         self.assertEqual(counter.internal_state["count"], 2)
+        self.assertEqual(counter.count, 2)
+        
+        # Wraps around at the counter width in both directions
+        counter.internal_state = {"count": 15}
+        counter.on_clock_edge()
+        self.assertEqual(counter.count, 0)
+        self.assertEqual(counter.outputs["carry"].state, LogicState.HIGH)
+        counter.count_up = False
+        counter.on_clock_edge()
+        self.assertEqual(counter.count, 15)
+
+    def test_counter_advance(self):
+        """Test that advancing several cycles matches per-edge clocking."""
+        for count_up in (True, False):
+            stepped = Counter("stepped", width=3, count_up=count_up)
+            batched = Counter("batched", width=3, count_up=count_up)
+            for counter in (stepped, batched):
+                counter.enable_signal.set_state(LogicState.HIGH)
+
+            for cycles in (1, 6, 9):
+                for _ in range(cycles):
+                    stepped.on_clock_edge()
+                batched.advance(cycles)
+
+                self.assertEqual(batched.internal_state["count"], stepped.internal_state["count"])
+                for name, signal in stepped.outputs.items():
+                    self.assertEqual(batched.outputs[name].state, signal.state)
+
+        # Disabled counters do not move
+        idle = Counter("idle", width=4)
+        idle.enable_signal.set_state(LogicState.LOW)
+        idle.advance(5)
+        self.assertEqual(idle.internal_state["count"], 0)
     
     def test_processor_fsm(self):
         """Test ProcessorFSM state machine."""
@@ -151,20 +262,38 @@ class TestLogicCircuits(unittest.TestCase):
         fsm.process_inputs()
         self.assertEqual(fsm.current_state, "FETCH")
 
+    def test_fsm_run_sequence(self):
+        """Test batch execution of an FSM event sequence."""
+        fsm = ProcessorFSM("seq_cpu")
+        path = fsm.run_sequence(["start", "instruction_ready", "halt_instruction",
+                                 "decoded", "executed"])
+
+        # halt_instruction is ignored while in DECODE
+        self.assertEqual([fsm.state_names[s] for s in path],
+                         ["FETCH", "DECODE", "DECODE", "EXECUTE", "WRITEBACK"])
+        self.assertEqual(fsm.current_state, "WRITEBACK")
+        self.assertEqual([state for state, _ in fsm.get_state_history()],
+                         ["FETCH", "DECODE", "EXECUTE", "WRITEBACK"])
+        self.assertEqual(fsm.output_signals["writeback_enable"].state, LogicState.HIGH)
+
+        # Event codes are accepted as well as names
+        code = fsm.event_codes["written_back"]
+        fsm.run_sequence([code])
+        self.assertEqual(fsm.current_state, "FETCH")
+
+        with self.assertRaises(ValueError):
+            fsm.run_sequence(["no_such_event"])
+
 
 class TestComponentInterface(unittest.TestCase):
     """Test cases for component interface system."""
     
     def setUp(self):
-        # Create temporary database
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.manager = ComponentManager(self.temp_db.name)
+        # In-memory database, private to this test
+        self.manager = ComponentManager(":memory:")
     
     def tearDown(self):
         self.manager.close()
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
     
     def test_component_manager_creation(self):
         """Test ComponentManager initialization."""
@@ -172,6 +301,32 @@ class TestComponentInterface(unittest.TestCase):
         self.assertIsInstance(self.manager.db, ComponentDatabase)
         self.assertIsInstance(self.manager.factory, ComponentFactory)
     
+    def test_type_counts(self):
+        """Test that type counts follow creation, replacement and reset."""
+        self.manager.create_component("tc_r", parameters={"resistance": 10})
+        self.manager.create_component("tc_ff", "flipflop", flip_flop_type="D")
+        self.manager.create_component("tc_cnt", "counter", width=4)
+        self.assertEqual(self.manager.type_counts, {"database": 1, "logic_class": 2})
+        
+        # Replacing a name swaps its type in the counts
+        self.manager.create_component("tc_cnt", parameters={"capacitance": 1e-9})
+        self.assertEqual(self.manager.type_counts, {"database": 2, "logic_class": 1})
+        
+        self.manager.reset()
+        self.assertEqual(self.manager.type_counts, {})
+    
+    def test_manager_reset(self):
+        """Test that reset drops components but keeps the database open."""
+        self.manager.create_component("reset_ff", "flipflop", flip_flop_type="D")
+        db = self.manager.db
+        self.manager.reset()
+        
+        self.assertEqual(self.manager.list_components(), [])
+        self.assertIs(self.manager.db, db)
+        resistor = self.manager.create_component("reset_r", parameters={"resistance": 10})
+        self.assertEqual(self.manager.list_components(), ["reset_r"])
+        self.assertEqual(resistor.parameters["resistance"], 10)
+    
     def test_database_component_creation(self):
         """Test creating database components through manager."""
         resistor = self.manager.create_component(
@@ -306,6 +461,15 @@ class TestComponentInterface(unittest.TestCase):
             # Check that file was created and has content
             self.assertTrue(os.path.exists(temp_file.name))
             self.assertGreater(os.path.getsize(temp_file.name), 0)
+            
+            # Modules reference their components by name
+            ff = self.manager.create_component("export_ff", "flipflop", flip_flop_type="D")
+            self.manager.create_module("export_mod", [self.manager.get_component("export_comp"), ff])
+            self.manager.export_design(temp_file.name)
+            with open(temp_file.name, encoding='utf-8') as f:
+                design = json.load(f)
+            self.assertEqual(design["modules"]["export_mod"]["components"], ["export_comp", "export_ff"])
+            self.assertEqual(design["components"]["export_comp"]["parameters"], {"value": 42})
         finally:
             if os.path.exists(temp_file.name):
                 os.unlink(temp_file.name)
@@ -321,19 +485,19 @@ class TestConvenienceFunctions(unittest.TestCase):
         )
         
         # Test resistor creation
-        resistor = create_resistor("conv_r", 2200, 0.01)
+        resistor = create_resistor("conv_r", 2200, 0.01, db_path=":memory:")
         self.assertEqual(resistor.name, "conv_r")
         
         # Test capacitor creation  
-        capacitor = create_capacitor("conv_c", 47e-6, 16.0)
+        capacitor = create_capacitor("conv_c", 47e-6, 16.0, db_path=":memory:")
         self.assertEqual(capacitor.name, "conv_c")
         
         # Test flipflop creation
-        flipflop = create_flipflop("conv_ff", "JK")
+        flipflop = create_flipflop("conv_ff", "JK", db_path=":memory:")
         self.assertEqual(flipflop.name, "conv_ff")
         
         # Test counter creation
-        counter = create_counter("conv_cnt", 12, False)
+        counter = create_counter("conv_cnt", 12, False, db_path=":memory:")
         self.assertEqual(counter.name, "conv_cnt")
 
 
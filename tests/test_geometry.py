@@ -48,6 +48,9 @@ class TestPoint(unittest.TestCase):
         
         # Distance to self should be 0
         self.assertEqual(self.p1.distance_to(self.p1), 0)
+        
+        # Squared distance avoids the square root
+        self.assertEqual(self.p1.distance_sq_to(self.p2), 25)
     
     def test_distance_to_line(self):
         """Test distance from point to line segment."""
@@ -63,6 +66,10 @@ class TestPoint(unittest.TestCase):
         point_above = Point(5, 3)
         distance = point_above.distance_to_line(line_start, line_end)
         self.assertAlmostEqual(distance, 3, places=10)
+        self.assertAlmostEqual(point_above.distance_sq_to_line(line_start, line_end), 9, places=10)
+        
+        # Point beyond the segment end measures to the endpoint
+        self.assertAlmostEqual(Point(13, 4).distance_to_line(line_start, line_end), 5, places=10)
     
     def test_point_repr(self):
         """Test string representation."""
@@ -127,6 +134,9 @@ class TestRectangle(unittest.TestCase):
         # Non-overlapping rectangles
         self.assertFalse(self.rect1.intersects(self.rect3))
         self.assertFalse(self.rect3.intersects(self.rect1))
+        
+        # Rectangles sharing only an edge still count as intersecting
+        self.assertTrue(self.rect1.intersects(Rectangle(10, 0, 5, 5)))
     
     def test_to_polygon_conversion(self):
         """Test conversion to polygon."""
@@ -180,7 +190,59 @@ class TestPolygon(unittest.TestCase):
         # Should raise error for too few vertices
         with self.assertRaises(ValueError):
             Polygon([Point(0, 0), Point(1, 1)])
-    
+
+    def test_polygon_from_array(self):
+        """Test polygon creation from coordinate pairs."""
+        polygon = Polygon.from_array([(0, 0), (4, 0), (2, 3)])
+        self.assertEqual(len(polygon.vertices), 3)
+        self.assertEqual(polygon.vertices[2], Point(2, 3))
+        self.assertAlmostEqual(polygon.area(), self.triangle.area(), places=10)
+
+        with self.assertRaises(ValueError):
+            Polygon.from_array([(0, 0), (1, 1)])
+
+    def test_polygon_vertices_assignment(self):
+        """Test replacing vertices and that the vertex sequence is read-only."""
+        polygon = Polygon([Point(0, 0), Point(4, 0), Point(2, 3)])
+        with self.assertRaises(AttributeError):
+            polygon.vertices.append(Point(10, 10))
+
+        polygon.vertices = [Point(0, 0), Point(4, 0), Point(4, 4), Point(0, 4)]
+        self.assertEqual(len(polygon), 4)
+        self.assertEqual(len(polygon.edges), 4)
+        self.assertAlmostEqual(polygon.area(), 16.0, places=10)
+        bbox = polygon.bounding_box()
+        self.assertEqual((bbox.width, bbox.height), (4, 4))
+
+        with self.assertRaises(ValueError):
+            polygon.vertices = [Point(0, 0), Point(1, 1)]
+
+    def test_polygon_array_storage(self):
+        """Test polygons built from coordinate arrays."""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("numpy not available")
+
+        coords = np.array([[0, 0], [4, 0], [4, 3], [0, 3]], dtype=np.float64)
+        polygon = Polygon(coords)
+        self.assertEqual(len(polygon), 4)
+        self.assertEqual(list(polygon), [Point(0, 0), Point(4, 0), Point(4, 3), Point(0, 3)])
+        self.assertAlmostEqual(polygon.area(), 12.0, places=10)
+
+        # The constructor copies, from_array adopts the buffer
+        self.assertIsNot(polygon.to_numpy(), coords)
+        self.assertIs(Polygon.from_array(coords).to_numpy(), coords)
+
+        with self.assertRaises(ValueError):
+            Polygon(np.zeros((4, 3)))
+
+    def test_slots(self):
+        """Test that geometry objects carry no per-instance __dict__."""
+        polygon = Polygon([Point(0, 0), Point(1, 0), Point(0, 1)])
+        for obj in (Point(1, 2), Rectangle(0, 0, 1, 1), polygon):
+            self.assertFalse(hasattr(obj, '__dict__'))
+
     def test_polygon_edges(self):
         """Test edge generation."""
         edges = self.triangle.edges
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for zlayout.spatial module.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from zlayout.geometry import Point, Rectangle, Polygon
+from zlayout.spatial import QuadTree, SpatialIndex, morton_order
+from zlayout.analysis import GeometryProcessor
+
+
+class TestQuadTree(unittest.TestCase):
+    """Test cases for QuadTree class."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.world = Rectangle(0, 0, 100, 100)
+        self.rects = [Rectangle(rng.uniform(0, 90), rng.uniform(0, 90),
+                                rng.uniform(1, 10), rng.uniform(1, 10))
+                      for _ in range(200)]
+
+    def test_insert_many_matches_insert(self):
+        """Test that bulk insertion answers queries like sequential insertion."""
+        sequential = QuadTree(self.world, capacity=4)
+        for rect in self.rects:
+            sequential.insert(rect)
+
+        bulk = QuadTree(self.world, capacity=4)
+        self.assertEqual(bulk.insert_many(self.rects), len(self.rects))
+        self.assertEqual(bulk.size(), sequential.size())
+
+        region = Rectangle(20, 20, 30, 30)
+        self.assertEqual({id(o) for o in bulk.query_range(region)},
+                         {id(o) for o in sequential.query_range(region)})
+
+    def test_count_range_matches_query(self):
+        """Test that counting agrees with the length of the query result."""
+        tree = QuadTree(self.world, capacity=4)
+        tree.insert_many(self.rects)
+        for region in (Rectangle(20, 20, 30, 30), Rectangle(0, 0, 100, 100),
+                       Rectangle(95, 95, 1, 1), Rectangle(200, 200, 5, 5)):
+            self.assertEqual(tree.count_range(region), len(tree.query_range(region)))
+
+    def test_straddling_object_is_found(self):
+        """Test that objects crossing quadrant borders are found from either side."""
+        tree = QuadTree(self.world, capacity=1)
+        tree.insert(Rectangle(5, 5, 1, 1))
+        straddler = Rectangle(45, 45, 10, 10)
+        tree.insert(straddler)
+
+        # Query only the north-east quadrant part of the straddling rectangle
+        self.assertIn(straddler, tree.query_range(Rectangle(52, 52, 1, 1)))
+
+    def test_insert_many_skips_out_of_bounds(self):
+        """Test that objects outside the world bounds are not inserted."""
+        tree = QuadTree(self.world)
+        inserted = tree.insert_many([Rectangle(10, 10, 1, 1), Rectangle(500, 500, 1, 1)])
+        self.assertEqual(inserted, 1)
+        self.assertEqual(tree.size(), 1)
+
+    def test_find_intersections_cache(self):
+        """Test that cached intersection pairs are refreshed after inserts."""
+        tree = QuadTree(self.world, capacity=4)
+        tree.insert_many(self.rects[:50])
+        first = tree.find_intersections()
+        self.assertEqual(tree.find_intersections(), first)
+
+        tree.insert(Rectangle(0, 0, 100, 100))
+        self.assertEqual(len(tree.find_intersections()), len(first) + 50)
+
+        tree.clear()
+        self.assertEqual(tree.find_intersections(), [])
+
+    def test_stats(self):
+        """Test that tree statistics reflect the actual structure."""
+        tree = QuadTree(self.world, capacity=4)
+        self.assertEqual(tree.stats()['node_count'], 1)
+        self.assertEqual(tree.stats()['depth'], 0)
+
+        tree.insert_many(self.rects)
+        stats = tree.stats()
+        self.assertEqual(stats['object_count'], len(self.rects))
+        self.assertEqual((stats['node_count'] - 1) % 4, 0)
+        self.assertGreater(stats['depth'], 0)
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_morton_order(self):
+        """Test Z-order sorting of bounding boxes."""
+        boxes = [Rectangle(90, 90, 1, 1), Rectangle(0, 0, 1, 1),
+                 Rectangle(90, 0, 1, 1), Rectangle(0, 90, 1, 1)]
+        self.assertEqual(morton_order(boxes, self.world), [1, 2, 3, 0])
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Test cases for SpatialIndex class."""
+
+    def test_add_objects_ids_follow_input_order(self):
+        """Test that batch insertion assigns IDs in input order."""
+        index = SpatialIndex(Rectangle(0, 0, 100, 100))
+        first = index.add_rectangle(Rectangle(1, 1, 2, 2))
+        objects = [Rectangle(80, 80, 5, 5),
+                   Polygon([Point(10, 10), Point(20, 10), Point(15, 20)])]
+
+        ids = index.add_objects(objects)
+        self.assertEqual(ids, [first + 1, first + 2])
+        self.assertIs(index.objects[ids[0]], objects[0])
+        self.assertIs(index.objects[ids[1]], objects[1])
+        self.assertEqual(index.quadtree.size(), 3)
+
+    def test_id_lookup_after_removal(self):
+        """Test that removed objects drop out of queries and cached pairs."""
+        index = SpatialIndex(Rectangle(0, 0, 100, 100))
+        ids = index.add_objects([
+            Polygon([Point(10, 10), Point(20, 10), Point(15, 20)]),
+            Polygon([Point(12, 12), Point(22, 12), Point(17, 22)]),
+            Rectangle(60, 60, 5, 5),
+        ])
+        self.assertEqual(index.find_intersecting_edges(), [(ids[0], ids[1])])
+        self.assertEqual(sorted(index.query_region(Rectangle(0, 0, 30, 30))), ids[:2])
+
+        self.assertTrue(index.remove_object(ids[1]))
+        self.assertEqual(index.find_intersecting_edges(), [])
+        self.assertEqual(index.query_region(Rectangle(0, 0, 30, 30)), [ids[0]])
+        self.assertEqual(index.find_nearby_objects(ids[2], 100), [ids[0]])
+
+    def test_processor_add_components(self):
+        """Test GeometryProcessor batch insertion."""
+        processor = GeometryProcessor(Rectangle(0, 0, 100, 100))
+        ids = processor.add_components([
+            Rectangle(10, 10, 5, 5),
+            Polygon([Point(20, 20), Point(30, 20), Point(25, 30)]),
+        ])
+        self.assertEqual(len(ids), 2)
+
+        with self.assertRaises(ValueError):
+            processor.add_components([Point(0, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
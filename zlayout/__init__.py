@@ -9,6 +9,8 @@ Now includes a flexible component system with database-stored components and
 class-based logic circuits for comprehensive EDA design workflows.
 """
 
+import importlib.util
+
 __version__ = "0.1.0"
 __author__ = "ZLayout Team"
 
@@ -30,13 +32,21 @@ from .component_interface import (
     create_flipflop, create_counter
 )
 
-# Import visualization only if matplotlib is available
-try:
-    from .visualization import LayoutVisualizer
-    _has_visualization = True
-except ImportError:
-    _has_visualization = False
-    LayoutVisualizer = None
+# Visualization is imported on first access to LayoutVisualizer, so that
+# importing zlayout does not pay for loading matplotlib
+_has_visualization = importlib.util.find_spec("matplotlib") is not None
+
+
+def __getattr__(name):
+    if name == 'LayoutVisualizer':
+        try:
+            from .visualization import LayoutVisualizer
+        except ImportError:
+            LayoutVisualizer = None
+        globals()['LayoutVisualizer'] = LayoutVisualizer
+        return LayoutVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Core geometry and spatial
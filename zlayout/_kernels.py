@@ -0,0 +1,116 @@
+"""
+Numeric kernels for hot geometry construction and simulation loops.
+
+Kernels are compiled with numba when it is installed; otherwise they run
+as ordinary Python functions with identical results.
+"""
+
+import math
+
+import numpy as np
+
+# Optional numba import - fall back to a no-op decorator if not available
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def rotated_rect(x, y, rotation, length, width):
+    """Vertices of a length x width rectangle centred on (x, y) and rotated
+    by `rotation` radians, as a (4, 2) array in counter-clockwise order."""
+    cos_r = math.cos(rotation)
+    sin_r = math.sin(rotation)
+    hl = 0.5 * length
+    hw = 0.5 * width
+
+    out = np.empty((4, 2))
+    out[0, 0] = -hl * cos_r + hw * sin_r + x
+    out[0, 1] = -hl * sin_r - hw * cos_r + y
+    out[1, 0] = hl * cos_r + hw * sin_r + x
+    out[1, 1] = hl * sin_r - hw * cos_r + y
+    out[2, 0] = hl * cos_r - hw * sin_r + x
+    out[2, 1] = hl * sin_r + hw * cos_r + y
+    out[3, 0] = -hl * cos_r - hw * sin_r + x
+    out[3, 1] = -hl * sin_r + hw * cos_r + y
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def trace_quad(x0, y0, x1, y1, width):
+    """Vertices of a straight trace of the given width from (x0, y0) to (x1, y1).
+
+    Zero-length traces become a 0.1 x 0.1 square anchored at the start point.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length = math.sqrt(dx * dx + dy * dy)
+
+    out = np.empty((4, 2))
+    if length < 1e-10:
+        out[0, 0] = x0
+        out[0, 1] = y0
+        out[1, 0] = x0 + 0.1
+        out[1, 1] = y0
+        out[2, 0] = x0 + 0.1
+        out[2, 1] = y0 + 0.1
+        out[3, 0] = x0
+        out[3, 1] = y0 + 0.1
+        return out
+
+    # Normalized perpendicular vector scaled to half the width
+    perp_x = -dy * width / (2 * length)
+    perp_y = dx * width / (2 * length)
+
+    out[0, 0] = x0 + perp_x
+    out[0, 1] = y0 + perp_y
+    out[1, 0] = x1 + perp_x
+    out[1, 1] = y1 + perp_y
+    out[2, 0] = x1 - perp_x
+    out[2, 1] = y1 - perp_y
+    out[3, 0] = x0 - perp_x
+    out[3, 1] = y0 - perp_y
+    return out
+
+
+@njit(cache=True)
+def run_transitions(table, start, events):
+    """Walk a (states x events) transition table from state index `start`,
+    returning the state index after each event."""
+    path = np.empty(len(events), dtype=np.int16)
+    state = start
+    for i in range(len(events)):
+        state = table[state, events[i]]
+        path[i] = state
+    return path
+
+
+@njit(cache=True, parallel=True)
+def vertex_angles(xs, ys, prev, nxt):
+    """Interior angle in degrees at every vertex of a flattened polygon buffer.
+
+    prev/nxt hold the neighbouring vertex indices. Returns (angles, valid)
+    where valid is False for vertices with a zero-length adjacent edge. Only
+    worth calling when numba is installed; the NumPy expression in
+    PolygonAnalyzer is faster than this loop in plain Python.
+    """
+    n = len(xs)
+    angles = np.empty(n)
+    valid = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        dx1 = xs[prev[i]] - xs[i]
+        dy1 = ys[prev[i]] - ys[i]
+        dx2 = xs[nxt[i]] - xs[i]
+        dy2 = ys[nxt[i]] - ys[i]
+        angles[i] = math.degrees(math.atan2(abs(dx1 * dy2 - dy1 * dx2), dx1 * dx2 + dy1 * dy2))
+        valid[i] = math.hypot(dx1, dy1) > 1e-10 and math.hypot(dx2, dy2) > 1e-10
+    return angles, valid
@@ -3,10 +3,19 @@ Advanced geometric analysis algorithms for layout optimization.
 """
 
 import math
-from typing import List, Tuple, Set, Dict, Optional, Union
+from typing import List, Tuple, Set, Dict, Optional, Union, Any
 from .geometry import Point, Rectangle, Polygon
 from .spatial import QuadTree, SpatialIndex
 
+# Optional numpy import - the analyzer falls back to scalar loops without it
+try:
+    import numpy as np
+    from ._kernels import HAS_NUMBA, vertex_angles
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    HAS_NUMBA = False
+
 
 class EdgeIntersectionResult:
     """Result of edge intersection analysis."""
@@ -102,6 +111,84 @@ def segments_intersect(p1: Point, p2: Point, p3: Point, p4: Point) -> bool:
     return False
 
 
+def _point_segment_distance_sq(px, py, sx, sy, ex, ey):
+    """Vectorized Point.distance_sq_to_line over coordinate arrays."""
+    line_x = ex - sx
+    line_y = ey - sy
+    line_length_sq = line_x * line_x + line_y * line_y
+    degenerate = line_length_sq < 1e-10
+    
+    point_x = px - sx
+    point_y = py - sy
+    t = np.clip((point_x * line_x + point_y * line_y) / np.where(degenerate, 1.0, line_length_sq), 0, 1)
+    t[degenerate] = 0.0
+    
+    dx = point_x - t * line_x
+    dy = point_y - t * line_y
+    return dx * dx + dy * dy
+
+
+def _edge_pair_distances(xs, ys, nxt, a, b):
+    """Distances between edges a -> nxt[a] and b -> nxt[b] (vectorized _edge_to_edge_distance)."""
+    x1, y1, x2, y2 = xs[a], ys[a], xs[nxt[a]], ys[nxt[a]]
+    x3, y3, x4, y4 = xs[b], ys[b], xs[nxt[b]], ys[nxt[b]]
+    
+    # Same candidates as _edge_to_edge_distance, one square root per pair
+    return np.sqrt(np.minimum.reduce([
+        _point_segment_distance_sq(x1, y1, x3, y3, x4, y4),
+        _point_segment_distance_sq(x2, y2, x3, y3, x4, y4),
+        _point_segment_distance_sq(x3, y3, x1, y1, x2, y2),
+        _point_segment_distance_sq(x4, y4, x1, y1, x2, y2),
+        (x1 - x3) ** 2 + (y1 - y3) ** 2, (x1 - x4) ** 2 + (y1 - y4) ** 2,
+        (x2 - x3) ** 2 + (y2 - y3) ** 2, (x2 - x4) ** 2 + (y2 - y4) ** 2,
+    ]))
+
+
+def _edge_pair_block(edge_distances, block):
+    """Edge index arrays (a, b) for one block of compute_edge_distances() pairs.
+    
+    Block i < n pairs polygon i's edges with its candidates' edges, ordered by
+    (candidate, edge of i, edge of candidate); block n holds the non-adjacent
+    edge pairs within each polygon.
+    """
+    bounds = edge_distances['bounds']
+    counts = np.diff(bounds)
+    candidates = edge_distances['candidates']
+    
+    if block < len(candidates):
+        others = np.asarray(candidates[block], dtype=np.intp)
+        widths = counts[others]
+        sizes = counts[block] * widths
+        which = np.repeat(np.arange(len(others)), sizes)
+        r = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        return bounds[block] + r // widths[which], bounds[others][which] + r % widths[which]
+    
+    # Non-adjacent edges within each polygon, skipping the last-first pair
+    a, b = [], []
+    for start, count in zip(bounds[:-1].tolist(), counts.tolist()):
+        i, j = np.triu_indices(count, 2)
+        keep = ~((i == 0) & (j == count - 1))
+        a.append(start + i[keep])
+        b.append(start + j[keep])
+    return (np.concatenate(a), np.concatenate(b)) if a else (np.empty(0, dtype=np.intp),) * 2
+
+
+def _edge_pair_endpoints(edge_distances, ks):
+    """Vertex indices (p1, p2, p3, p4) of the selected compute_edge_distances() pairs."""
+    ks = np.asarray(ks, dtype=np.intp)
+    offsets, nxt = edge_distances['offsets'], edge_distances['next']
+    endpoints = np.empty((len(ks), 4), dtype=np.intp)
+    blocks = np.searchsorted(offsets, ks, side='right') - 1
+    
+    for block in np.unique(blocks).tolist():
+        selected = blocks == block
+        a, b = _edge_pair_block(edge_distances, block)
+        local = ks[selected] - offsets[block]
+        a, b = a[local], b[local]
+        endpoints[selected] = np.stack([a, nxt[a], b, nxt[b]], axis=1)
+    return endpoints
+
+
 class PolygonAnalyzer:
     """Analyzer for polygon geometric properties and relationships."""
     
@@ -109,6 +196,8 @@ class PolygonAnalyzer:
         self.spatial_index = spatial_index
         self.polygons: List[Polygon] = []
         self.polygon_ids: List[int] = []
+        self._vertex_soa: Optional[Dict] = None
+        self._vertex_soa_key: Optional[List[Tuple[int, 'np.ndarray']]] = None
     
     def add_polygon(self, polygon: Polygon) -> int:
         """Add a polygon for analysis."""
@@ -120,85 +209,182 @@ class PolygonAnalyzer:
             self.polygon_ids.append(poly_id)
         return poly_id
     
-    def find_sharp_angles(self, threshold_degrees: float = 30.0) -> SharpAngleResult:
-        """Find all sharp angles in all polygons."""
-        result = SharpAngleResult()
+    def add_polygons(self, polygons: List[Polygon]) -> List[int]:
+        """Add several polygons for analysis, returning their IDs in input order."""
+        if self.spatial_index:
+            return self.spatial_index.add_objects(polygons)
         
-        polygons_to_analyze = []
+        start = len(self.polygons)
+        poly_ids = list(range(start, start + len(polygons)))
+        self.polygons.extend(polygons)
+        self.polygon_ids.extend(poly_ids)
+        return poly_ids
+    
+    def _polygons_to_analyze(self) -> List[Tuple[int, Polygon]]:
+        """Collect (id, polygon) pairs from the spatial index or local list."""
         if self.spatial_index:
-            for obj_id, obj in self.spatial_index.objects.items():
-                if isinstance(obj, Polygon):
-                    polygons_to_analyze.append((obj_id, obj))
-        else:
-            for i, polygon in enumerate(self.polygons):
-                polygons_to_analyze.append((i, polygon))
+            return [(obj_id, obj) for obj_id, obj in self.spatial_index.objects.items()
+                    if isinstance(obj, Polygon)]
+        return list(enumerate(self.polygons))
+    
+    def _get_vertex_soa(self, polygons_to_analyze: List[Tuple[int, Polygon]]) -> Dict:
+        """Flatten all polygon vertices into contiguous arrays.
         
-        total_angles = 0
-        angle_sum = 0.0
+        The buffer is cached and rebuilt when the analyzed ids change or a
+        polygon's coordinate array is replaced (list slots can be reassigned).
+        """
+        key = [(poly_id, polygon.to_numpy()) for poly_id, polygon in polygons_to_analyze]
+        cached = self._vertex_soa_key
+        if (self._vertex_soa is not None and len(cached) == len(key) and
+                all(id1 == id2 and xy1 is xy2 for (id1, xy1), (id2, xy2) in zip(cached, key))):
+            return self._vertex_soa
+        
+        counts = np.fromiter((len(polygon) for _, polygon in polygons_to_analyze),
+                             dtype=np.intp, count=len(polygons_to_analyze))
+        total = int(counts.sum())
+        xy = np.concatenate([xy for _, xy in key])
+        xs = np.ascontiguousarray(xy[:, 0])
+        ys = np.ascontiguousarray(xy[:, 1])
+        
+        poly_start = np.zeros(len(counts), dtype=np.intp)
+        np.cumsum(counts[:-1], out=poly_start[1:])
+        owner = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(total) - poly_start[owner]
+        
+        self._vertex_soa = {
+            'xs': xs,
+            'ys': ys,
+            'poly_start': poly_start,
+            'poly_ids': np.array([poly_id for poly_id, _ in key], dtype=np.int64),
+            'owner': owner,
+            'prev': poly_start[owner] + (local - 1) % counts[owner],
+            'next': poly_start[owner] + (local + 1) % counts[owner],
+        }
+        self._vertex_soa_key = key
+        return self._vertex_soa
+    
+    def compute_vertex_angles(self) -> Dict:
+        """Compute the interior angle at every polygon vertex.
         
-        for poly_id, polygon in polygons_to_analyze:
-            sharp_vertices = polygon.get_sharp_angles(threshold_degrees)
+        Vertices with a zero-length adjacent edge are skipped. Returns a dict
+        with parallel 'poly_ids', 'vertex_indices' and 'angles' (degrees)
+        sequences; they are numpy arrays when numpy is available.
+        """
+        polygons_to_analyze = self._polygons_to_analyze()
+        
+        if not HAS_NUMPY:
+            poly_ids, vertex_indices, angles = [], [], []
+            for poly_id, polygon in polygons_to_analyze:
+                vertices = polygon.vertices
+                n = len(vertices)
+                for i, curr in enumerate(vertices):
+                    prev, nxt = vertices[i - 1], vertices[(i + 1) % n]
+                    dx1, dy1 = prev.x - curr.x, prev.y - curr.y
+                    dx2, dy2 = nxt.x - curr.x, nxt.y - curr.y
+                    if math.hypot(dx1, dy1) > 1e-10 and math.hypot(dx2, dy2) > 1e-10:
+                        poly_ids.append(poly_id)
+                        vertex_indices.append(i)
+                        angles.append(math.degrees(math.atan2(abs(dx1 * dy2 - dy1 * dx2),
+                                                              dx1 * dx2 + dy1 * dy2)))
+            return {'poly_ids': poly_ids, 'vertex_indices': vertex_indices, 'angles': angles}
+        
+        if not polygons_to_analyze:
+            return {'poly_ids': np.empty(0, dtype=np.int64),
+                    'vertex_indices': np.empty(0, dtype=np.intp),
+                    'angles': np.empty(0, dtype=np.float64)}
+        
+        soa = self._get_vertex_soa(polygons_to_analyze)
+        xs, ys = soa['xs'], soa['ys']
+        
+        if HAS_NUMBA:
+            # One fused pass per vertex instead of a dozen temporary arrays
+            angles, valid = vertex_angles(xs, ys, soa['prev'], soa['next'])
+        else:
+            dx1 = xs[soa['prev']] - xs
+            dy1 = ys[soa['prev']] - ys
+            dx2 = xs[soa['next']] - xs
+            dy2 = ys[soa['next']] - ys
             
-            # Calculate actual angles for sharp vertices
-            for vertex_idx in sharp_vertices:
-                n = len(polygon.vertices)
-                prev_vertex = polygon.vertices[(vertex_idx - 1) % n]
-                curr_vertex = polygon.vertices[vertex_idx]
-                next_vertex = polygon.vertices[(vertex_idx + 1) % n]
-                
-                # Calculate angle
-                v1 = Point(prev_vertex.x - curr_vertex.x, prev_vertex.y - curr_vertex.y)
-                v2 = Point(next_vertex.x - curr_vertex.x, next_vertex.y - curr_vertex.y)
-                
-                dot_product = v1.x * v2.x + v1.y * v2.y
-                mag1 = math.sqrt(v1.x**2 + v1.y**2)
-                mag2 = math.sqrt(v2.x**2 + v2.y**2)
-                
-                if mag1 > 1e-10 and mag2 > 1e-10:
-                    cos_angle = dot_product / (mag1 * mag2)
-                    cos_angle = max(-1.0, min(1.0, cos_angle))
-                    angle_degrees = math.degrees(math.acos(cos_angle))
-                    
-                    result.sharp_angles.append((poly_id, vertex_idx, angle_degrees))
-                    result.sharpest_angle = min(result.sharpest_angle, angle_degrees)
-                    angle_sum += angle_degrees
-                    total_angles += 1
+            cross = dx1 * dy2 - dy1 * dx2
+            dot = dx1 * dx2 + dy1 * dy2
+            angles = np.degrees(np.arctan2(np.abs(cross), dot))
+            valid = (np.hypot(dx1, dy1) > 1e-10) & (np.hypot(dx2, dy2) > 1e-10)
+        
+        valid = np.flatnonzero(valid)
+        owner = soa['owner'][valid]
+        return {
+            'poly_ids': soa['poly_ids'][owner],
+            'vertex_indices': valid - soa['poly_start'][owner],
+            'angles': angles[valid],
+        }
+    
+    def threshold_sharp_angles(self, vertex_angles: Dict,
+                               threshold_degrees: float = 30.0) -> SharpAngleResult:
+        """Select sharp angles from compute_vertex_angles() output.
         
-        if total_angles > 0:
-            result.average_angle = angle_sum / total_angles
+        Uses the same detection rule as Polygon.get_sharp_angles.
+        """
+        result = SharpAngleResult()
+        angles = vertex_angles['angles']
+        tolerance = 5.0  # degrees
+        
+        if HAS_NUMPY:
+            mask = ((angles < threshold_degrees * 0.8) |
+                    ((angles > threshold_degrees) & (angles < threshold_degrees + tolerance)))
+            hits = np.flatnonzero(mask)
+            result.sharp_angles = list(zip(vertex_angles['poly_ids'][hits].tolist(),
+                                           vertex_angles['vertex_indices'][hits].tolist(),
+                                           angles[hits].tolist()))
+        else:
+            result.sharp_angles = [
+                (poly_id, vertex_idx, angle)
+                for poly_id, vertex_idx, angle in zip(vertex_angles['poly_ids'],
+                                                      vertex_angles['vertex_indices'], angles)
+                if angle < threshold_degrees * 0.8 or
+                threshold_degrees < angle < threshold_degrees + tolerance
+            ]
+        
+        if result.sharp_angles:
+            sharp = [angle for _, _, angle in result.sharp_angles]
+            result.sharpest_angle = min(result.sharpest_angle, min(sharp))
+            result.average_angle = sum(sharp) / len(sharp)
         
         return result
     
-    def find_narrow_distances(self, threshold_distance: float = 1.0) -> NarrowDistanceResult:
-        """Find regions where polygon edges are too close together."""
-        result = NarrowDistanceResult()
+    def find_sharp_angles(self, threshold_degrees: float = 30.0) -> SharpAngleResult:
+        """Find all sharp angles in all polygons."""
+        return self.threshold_sharp_angles(self.compute_vertex_angles(), threshold_degrees)
+    
+    def compute_edge_distances(self, max_distance: Optional[float] = None) -> Dict:
+        """Compute the distance between every checked pair of polygon edges.
         
-        polygons_to_analyze = []
-        if self.spatial_index:
-            for obj_id, obj in self.spatial_index.objects.items():
-                if isinstance(obj, Polygon):
-                    polygons_to_analyze.append((obj_id, obj))
-        else:
-            for i, polygon in enumerate(self.polygons):
-                polygons_to_analyze.append((i, polygon))
+        Covers edges of different polygons and non-adjacent edges of the same
+        polygon. Returns a dict with a 'distances' sequence; use
+        edge_pair_points() to recover the endpoints of the k-th pair.
+        
+        With max_distance set, polygon pairs whose bounding boxes are further
+        apart than max_distance are skipped. Narrow regions below that cutoff
+        are unaffected, but the max/average statistics then only cover the
+        remaining pairs.
+        """
+        polygons_to_analyze = self._polygons_to_analyze()
+        candidates = self._distance_candidates(polygons_to_analyze, max_distance)
+        if HAS_NUMPY:
+            return self._compute_edge_distances_numpy(polygons_to_analyze, candidates)
         
         distances = []
+        edge_pairs = []
         
         # Check distances between edges of different polygons
         for i, (id1, poly1) in enumerate(polygons_to_analyze):
-            for j, (id2, poly2) in enumerate(polygons_to_analyze[i+1:], i+1):
+            edges1 = poly1.edges
+            for j in candidates[i]:
+                id2, poly2 = polygons_to_analyze[j]
                 # Check all edge pairs between the two polygons
-                for edge1 in poly1.edges:
+                for edge1 in edges1:
                     for edge2 in poly2.edges:
-                        dist = self._edge_to_edge_distance(edge1[0], edge1[1], edge2[0], edge2[1])
-                        distances.append(dist)
-                        
-                        if dist < threshold_distance:
-                            # Find closest points on the edges
-                            closest_points = self._closest_points_on_edges(
-                                edge1[0], edge1[1], edge2[0], edge2[1]
-                            )
-                            result.narrow_regions.append((closest_points[0], closest_points[1], dist))
+                        distances.append(self._edge_to_edge_distance(edge1[0], edge1[1], edge2[0], edge2[1]))
+                        edge_pairs.append((edge1[0], edge1[1], edge2[0], edge2[1]))
         
         # Also check within same polygon (self-intersection prevention)
         for poly_id, polygon in polygons_to_analyze:
@@ -207,23 +393,126 @@ class PolygonAnalyzer:
                 for j, edge2 in enumerate(edges[i+2:], i+2):  # Skip adjacent edges
                     if j == len(edges) - 1 and i == 0:  # Skip last-first edge pair
                         continue
-                        
-                    dist = self._edge_to_edge_distance(edge1[0], edge1[1], edge2[0], edge2[1])
-                    distances.append(dist)
                     
-                    if dist < threshold_distance:
-                        closest_points = self._closest_points_on_edges(
-                            edge1[0], edge1[1], edge2[0], edge2[1]
-                        )
-                        result.narrow_regions.append((closest_points[0], closest_points[1], dist))
+                    distances.append(self._edge_to_edge_distance(edge1[0], edge1[1], edge2[0], edge2[1]))
+                    edge_pairs.append((edge1[0], edge1[1], edge2[0], edge2[1]))
+        
+        return {'distances': distances, 'edge_pairs': edge_pairs}
+    
+    def _distance_candidates(self, polygons_to_analyze: List[Tuple[int, Polygon]],
+                             max_distance: Optional[float]) -> List[List[int]]:
+        """For each polygon position i, the later positions j to pair it with.
+        
+        Without a cutoff every later polygon is a candidate. Otherwise only
+        polygons whose bounding boxes come within max_distance are kept,
+        found through the spatial index when there is one.
+        """
+        n = len(polygons_to_analyze)
+        if max_distance is None:
+            return [list(range(i + 1, n)) for i in range(n)]
+        
+        regions = []
+        for _, polygon in polygons_to_analyze:
+            bbox = polygon.bounding_box()
+            regions.append(Rectangle(bbox.x - max_distance, bbox.y - max_distance,
+                                     bbox.width + 2 * max_distance,
+                                     bbox.height + 2 * max_distance))
+        
+        if self.spatial_index:
+            position = {obj_id: k for k, (obj_id, _) in enumerate(polygons_to_analyze)}
+            candidates = []
+            for i, region in enumerate(regions):
+                found = (position.get(obj_id) for obj_id in self.spatial_index.query_region(region))
+                candidates.append(sorted(j for j in found if j is not None and j > i))
+            return candidates
+        
+        boxes = [polygon.bounding_box() for _, polygon in polygons_to_analyze]
+        return [[j for j in range(i + 1, n) if region.intersects(boxes[j])]
+                for i, region in enumerate(regions)]
+    
+    def _compute_edge_distances_numpy(self, polygons_to_analyze: List[Tuple[int, Polygon]],
+                                      candidates: List[List[int]]) -> Dict:
+        """Vectorized compute_edge_distances() over the flattened vertex buffer.
+        
+        Edge k runs from vertex k to vertex next[k]; pairs are emitted in the
+        same order as the scalar loops. Pairs are generated one polygon row at
+        a time and only their distances are kept, so memory stays bounded by
+        the largest row; _edge_pair_endpoints() regenerates selected pairs.
+        """
+        soa = self._get_vertex_soa(polygons_to_analyze) if polygons_to_analyze else None
+        if soa is None:
+            xs = ys = np.empty(0, dtype=np.float64)
+            nxt = np.empty(0, dtype=np.intp)
+            bounds = np.zeros(1, dtype=np.intp)
+        else:
+            xs, ys, nxt = soa['xs'], soa['ys'], soa['next']
+            bounds = np.append(soa['poly_start'], len(xs))
+        counts = np.diff(bounds)
+        
+        # Block i pairs polygon i with its candidates, the last block is intra-polygon
+        sizes = [int(counts[i]) * int(counts[others].sum()) for i, others in enumerate(candidates)]
+        sizes.append(int((counts * (counts - 3) // 2).sum()))
+        offsets = np.zeros(len(sizes) + 1, dtype=np.intp)
+        np.cumsum(sizes, out=offsets[1:])
+        
+        edge_distances = {'distances': np.empty(int(offsets[-1]), dtype=np.float64),
+                          'xy': np.stack([xs, ys], axis=1),
+                          'next': nxt,
+                          'bounds': bounds,
+                          'candidates': candidates,
+                          'offsets': offsets}
+        for block, size in enumerate(sizes):
+            if size:
+                a, b = _edge_pair_block(edge_distances, block)
+                edge_distances['distances'][offsets[block]:offsets[block + 1]] = \
+                    _edge_pair_distances(xs, ys, nxt, a, b)
+        return edge_distances
+    
+    @staticmethod
+    def edge_pair_points(edge_distances: Dict, k: int) -> Tuple[Point, Point, Point, Point]:
+        """Endpoints (p1, p2, p3, p4) of the k-th pair from compute_edge_distances()."""
+        if 'edge_pairs' in edge_distances:
+            return edge_distances['edge_pairs'][k]
+        coords = edge_distances['xy'][_edge_pair_endpoints(edge_distances, [k])[0]].tolist()
+        return tuple(Point(x, y) for x, y in coords)
+    
+    def threshold_narrow_distances(self, edge_distances: Dict,
+                                   threshold_distance: float = 1.0) -> NarrowDistanceResult:
+        """Select narrow regions from compute_edge_distances() output."""
+        result = NarrowDistanceResult()
+        distances = edge_distances['distances']
+        
+        if len(distances) == 0:
+            return result
         
-        if distances:
+        if HAS_NUMPY:
+            narrow = np.flatnonzero(distances < threshold_distance).tolist()
+            result.min_distance = float(distances.min())
+            result.max_distance = float(distances.max())
+            result.average_distance = float(distances.mean())
+        else:
+            narrow = [k for k, dist in enumerate(distances) if dist < threshold_distance]
             result.min_distance = min(distances)
             result.max_distance = max(distances)
             result.average_distance = sum(distances) / len(distances)
         
+        if 'edge_pairs' in edge_distances:
+            edge_pairs = [edge_distances['edge_pairs'][k] for k in narrow]
+        else:
+            coords = edge_distances['xy'][_edge_pair_endpoints(edge_distances, narrow)].tolist()
+            edge_pairs = [tuple(Point(x, y) for x, y in pair) for pair in coords]
+        
+        for k, edge_pair in zip(narrow, edge_pairs):
+            # Find closest points on the edges
+            closest_points = self._closest_points_on_edges(*edge_pair)
+            result.narrow_regions.append((closest_points[0], closest_points[1], float(distances[k])))
+        
         return result
     
+    def find_narrow_distances(self, threshold_distance: float = 1.0) -> NarrowDistanceResult:
+        """Find regions where polygon edges are too close together."""
+        return self.threshold_narrow_distances(self.compute_edge_distances(), threshold_distance)
+    
     def find_edge_intersections(self) -> EdgeIntersectionResult:
         """Find all edge intersections using spatial indexing for efficiency."""
         result = EdgeIntersectionResult()
@@ -268,21 +557,22 @@ class PolygonAnalyzer:
     
     def _edge_to_edge_distance(self, p1: Point, p2: Point, p3: Point, p4: Point) -> float:
         """Calculate minimum distance between two line segments."""
+        # Compare squared distances and take a single square root at the end
         # Try all point-to-line distances
-        distances = [
-            p1.distance_to_line(p3, p4),
-            p2.distance_to_line(p3, p4),
-            p3.distance_to_line(p1, p2),
-            p4.distance_to_line(p1, p2)
+        distances_sq = [
+            p1.distance_sq_to_line(p3, p4),
+            p2.distance_sq_to_line(p3, p4),
+            p3.distance_sq_to_line(p1, p2),
+            p4.distance_sq_to_line(p1, p2)
         ]
         
         # Also check endpoint-to-endpoint distances
-        distances.extend([
-            p1.distance_to(p3), p1.distance_to(p4),
-            p2.distance_to(p3), p2.distance_to(p4)
+        distances_sq.extend([
+            p1.distance_sq_to(p3), p1.distance_sq_to(p4),
+            p2.distance_sq_to(p3), p2.distance_sq_to(p4)
         ])
         
-        return min(distances)
+        return math.sqrt(min(distances_sq))
     
     def _closest_points_on_edges(self, p1: Point, p2: Point, p3: Point, p4: Point) -> Tuple[Point, Point]:
         """Find the closest points on two line segments."""
@@ -295,7 +585,7 @@ class PolygonAnalyzer:
         ]
         
         for pt1, pt2 in candidates:
-            dist = pt1.distance_to(pt2)
+            dist = pt1.distance_sq_to(pt2)
             if dist < min_dist:
                 min_dist = dist
                 closest_pair = (pt1, pt2)
@@ -310,8 +600,19 @@ class GeometryProcessor:
         self.spatial_index = SpatialIndex(world_bounds)
         self.analyzer = PolygonAnalyzer(self.spatial_index)
     
-    def add_component(self, geometry: Union[Rectangle, Polygon]) -> int:
-        """Add a geometric component to the processor."""
+    @staticmethod
+    def _as_geometry(geometry: Any) -> Union[Rectangle, Polygon]:
+        """Adopt an (N, 2) float64 vertex array as a Polygon without copying."""
+        if HAS_NUMPY and isinstance(geometry, np.ndarray):
+            return Polygon.from_array(geometry)
+        return geometry
+    
+    def add_component(self, geometry: Union[Rectangle, Polygon, Any]) -> int:
+        """Add a geometric component to the processor.
+        
+        An (N, 2) vertex array is accepted in place of a Polygon.
+        """
+        geometry = self._as_geometry(geometry)
         if isinstance(geometry, Rectangle):
             return self.spatial_index.add_rectangle(geometry)
         elif isinstance(geometry, Polygon):
@@ -319,13 +620,46 @@ class GeometryProcessor:
         else:
             raise ValueError("Unsupported geometry type")
     
+    def add_components(self, geometries: List[Union[Rectangle, Polygon]]) -> List[int]:
+        """Add several geometric components at once, returning their IDs in order.
+        
+        (N, 2) vertex arrays are accepted in place of Polygons.
+        """
+        geometries = [self._as_geometry(geometry) for geometry in geometries]
+        for geometry in geometries:
+            if not isinstance(geometry, (Rectangle, Polygon)):
+                raise ValueError("Unsupported geometry type")
+        return self.spatial_index.add_objects(geometries)
+    
+    def analyze_layout_raw(self, distance_cutoff: Optional[float] = None) -> Dict:
+        """Compute the threshold-independent part of the layout analysis.
+        
+        The returned block can be passed to analyze_layout() and
+        optimize_layout() to evaluate several sets of thresholds over the
+        same geometry without repeating the geometric work. A distance_cutoff
+        skips polygon pairs further apart than the largest narrow-distance
+        threshold you intend to use.
+        """
+        return {
+            'angles': self.analyzer.compute_vertex_angles(),
+            'distances': self.analyzer.compute_edge_distances(distance_cutoff),
+            'intersections': self.analyzer.find_edge_intersections(),
+        }
+    
     def analyze_layout(self, sharp_angle_threshold: float = 30.0, 
-                      narrow_distance_threshold: float = 1.0) -> Dict:
-        """Perform comprehensive layout analysis."""
+                      narrow_distance_threshold: float = 1.0,
+                      raw: Optional[Dict] = None) -> Dict:
+        """Perform comprehensive layout analysis.
+        
+        If `raw` (from analyze_layout_raw) is given, only the thresholds are
+        applied; otherwise the geometry is analyzed from scratch.
+        """
+        if raw is None:
+            raw = self.analyze_layout_raw()
         results = {}
         
         # Analyze sharp angles
-        sharp_angles = self.analyzer.find_sharp_angles(sharp_angle_threshold)
+        sharp_angles = self.analyzer.threshold_sharp_angles(raw['angles'], sharp_angle_threshold)
         results['sharp_angles'] = {
             'count': len(sharp_angles.sharp_angles),
             'sharpest': sharp_angles.sharpest_angle,
@@ -334,7 +668,8 @@ class GeometryProcessor:
         }
         
         # Analyze narrow distances
-        narrow_distances = self.analyzer.find_narrow_distances(narrow_distance_threshold)
+        narrow_distances = self.analyzer.threshold_narrow_distances(raw['distances'],
+                                                                    narrow_distance_threshold)
         results['narrow_distances'] = {
             'count': len(narrow_distances.narrow_regions),
             'minimum': narrow_distances.min_distance,
@@ -344,7 +679,7 @@ class GeometryProcessor:
         }
         
         # Analyze edge intersections
-        intersections = self.analyzer.find_edge_intersections()
+        intersections = raw['intersections']
         results['intersections'] = {
             'polygon_pairs': len(intersections.intersecting_pairs),
             'total_points': intersections.total_intersections,
@@ -354,9 +689,9 @@ class GeometryProcessor:
         
         return results
     
-    def optimize_layout(self) -> Dict:
+    def optimize_layout(self, raw: Optional[Dict] = None) -> Dict:
         """Suggest layout optimizations based on analysis."""
-        analysis = self.analyze_layout()
+        analysis = self.analyze_layout(raw=raw)
         suggestions = []
         
         if analysis['sharp_angles']['count'] > 0:
@@ -7,6 +7,8 @@ EDA组件数据库系统（简化版）
 import sqlite3
 import json
 import uuid
+import functools
+import contextlib
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
@@ -30,9 +32,29 @@ class ComponentSpec:
 class ComponentDatabase:
     """组件数据库管理器"""
     
+    # 自定义组件规格缓存的最大条目数
+    CUSTOM_COMPONENT_CACHE_SIZE = 4096
+    
+    # 连接建立时执行的PRAGMA：WAL日志、每次提交不强制fsync、临时表放内存、
+    # 64MB页缓存、256MB内存映射
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
+    
     def __init__(self, db_path: str = "components.db"):
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path)
+        for pragma in self.CONNECTION_PRAGMAS:
+            self.conn.execute(pragma)
+        # batch() 嵌套深度，大于0时各写操作不单独提交
+        self._batch_depth = 0
+        # 按实例缓存，相同规格的自定义组件复用同一行ID
+        self._custom_component_cache = functools.lru_cache(
+            maxsize=self.CUSTOM_COMPONENT_CACHE_SIZE)(self._insert_custom_component)
         self._init_database()
     
     def _init_database(self):
@@ -157,7 +179,7 @@ class ComponentDatabase:
             json.dumps(spec.tags)
         ))
         
-        self.conn.commit()
+        self._commit()
         return component_id
     
     def get_component(self, component_id: str) -> Optional[ComponentSpec]:
@@ -216,18 +238,45 @@ class ComponentDatabase:
                               electrical_params: Optional[Dict[str, Any]] = None,
                               physical_params: Optional[Dict[str, Any]] = None,
                               description: str = "") -> str:
-        """创建自定义组件"""
-        spec = ComponentSpec(
-            name=name,
-            category="custom",
-            parameters=parameters,
-            electrical_params=electrical_params if electrical_params else {},
-            physical_params=physical_params if physical_params else {},
-            description=description,
-            tags=["custom"]
+        """创建自定义组件
+        
+        相同规格（名称、参数、描述均一致）的重复调用返回同一个组件ID，
+        不会重复插入数据库。
+        """
+        return self._custom_component_cache(
+            name,
+            json.dumps(parameters, sort_keys=True),
+            json.dumps(electrical_params if electrical_params else {}, sort_keys=True),
+            json.dumps(physical_params if physical_params else {}, sort_keys=True),
+            description
         )
+    
+    def _insert_custom_component(self,
+                                 name: str,
+                                 parameters_json: str,
+                                 electrical_json: str,
+                                 physical_json: str,
+                                 description: str) -> str:
+        """插入规范化后的自定义组件（由缓存调用）"""
+        component_id = str(uuid.uuid4())
         
-        return self.add_component(spec)
+        self.conn.execute('''
+            INSERT INTO components (id, name, category, parameters, electrical_params, 
+                                  physical_params, description, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            component_id,
+            name,
+            "custom",
+            parameters_json,
+            electrical_json,
+            physical_json,
+            description,
+            json.dumps(["custom"])
+        ))
+        
+        self._commit()
+        return component_id
     
     def create_module(self,
                      name: str,
@@ -252,9 +301,35 @@ class ComponentDatabase:
             json.dumps(connections)
         ))
         
-        self.conn.commit()
+        self._commit()
         return module_id
     
+    def _commit(self):
+        """提交当前事务，处于 batch() 中时推迟到批次结束"""
+        if self._batch_depth == 0:
+            self.conn.commit()
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """把多次写操作合并为一个事务，最外层批次结束时统一提交
+        
+        批次中出现异常时回滚整个事务，并清空自定义组件缓存（缓存中可能
+        有已回滚的行ID）。
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+                self._custom_component_cache.cache_clear()
+            raise
+        else:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.commit()
+    
     def get_component_library(self) -> Dict[str, Any]:
         """获取组件库概览"""
         cursor = self.conn.execute('''
@@ -263,15 +338,12 @@ class ComponentDatabase:
             GROUP BY category
         ''')
         
-        library = {}
-        for row in cursor.fetchall():
-            category, count = row
-            library[category] = count
-        
-        return library
+        # 每行即 (类别, 数量) 二元组，直接构造字典
+        return dict(cursor.fetchall())
     
     def close(self):
         """关闭数据库连接"""
+        self._custom_component_cache.cache_clear()
         if self.conn:
             self.conn.close()
 
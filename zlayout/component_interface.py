@@ -6,6 +6,7 @@ EDA组件接口 - 统一的组件管理接口
 
 from typing import Dict, Any, Optional, Union, List
 from abc import ABC, abstractmethod
+import collections
 import json
 from enum import Enum
 
@@ -252,13 +253,25 @@ class ComponentManager:
         self.factory = ComponentFactory(self.db)
         self.components = {}  # 实例化的组件
         self.modules = {}     # 模块定义
+        # 按组件类型（ComponentType.value）统计的数量，随创建/替换增量维护
+        # （logic_circuits.Counter 与 collections.Counter 同名，这里用全名）
+        self._type_counts: collections.Counter = collections.Counter()
         
     def create_component(self, name: str, component_type: str = None, **kwargs) -> ComponentInterface:
         """创建组件"""
         component = self.factory.create_component(name, component_type, **kwargs)
+        replaced = self.components.get(name)
+        if replaced is not None:
+            self._type_counts[replaced.component_type.value] -= 1
         self.components[name] = component
+        self._type_counts[component.component_type.value] += 1
         return component
     
+    @property
+    def type_counts(self) -> Dict[str, int]:
+        """各组件类型的数量（副本）"""
+        return {comp_type: count for comp_type, count in self._type_counts.items() if count > 0}
+    
     def get_component(self, name: str) -> Optional[ComponentInterface]:
         """获取组件"""
         return self.components.get(name)
@@ -313,15 +326,35 @@ class ComponentManager:
         }
     
     def export_design(self, filename: str):
-        """导出设计"""
-        design = {
-            "components": {name: comp.get_info() for name, comp in self.components.items()},
-            "modules": self.modules,
-            "connections": {name: comp.connections for name, comp in self.components.items()}
+        """导出设计
+        
+        组件信息和连接在一次遍历中收集；模块中的组件按名称引用，
+        不再递归序列化组件对象本身（其中包含数据库连接等无法导出的成员）。
+        """
+        components = {}
+        connections = {}
+        for name, comp in self.components.items():
+            components[name] = comp.get_info()
+            connections[name] = comp.connections
+        
+        modules = {
+            name: {**module, "components": list(module["components"])}
+            for name, module in self.modules.items()
         }
+        design = {"components": components, "modules": modules, "connections": connections}
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(design, f, indent=2, ensure_ascii=False, cls=ComponentJSONEncoder)
+            f.write(json.dumps(design, indent=2, ensure_ascii=False, cls=ComponentJSONEncoder))
+    
+    def batch(self):
+        """批量创建组件时合并数据库提交（见 ComponentDatabase.batch）"""
+        return self.db.batch()
+    
+    def reset(self):
+        """清空已实例化的组件和模块，保留数据库连接供后续复用"""
+        self.components.clear()
+        self.modules.clear()
+        self._type_counts.clear()
     
     def close(self):
         """关闭数据库连接"""
@@ -332,9 +365,10 @@ def create_component_manager(db_path: str = "components.db") -> ComponentManager
     """创建组件管理器"""
     return ComponentManager(db_path)
 
-def create_resistor(name: str, resistance: float, tolerance: float = 0.05) -> ComponentInterface:
+def create_resistor(name: str, resistance: float, tolerance: float = 0.05,
+                    db_path: str = "components.db") -> ComponentInterface:
     """创建电阻器"""
-    manager = ComponentManager()
+    manager = ComponentManager(db_path)
     return manager.create_component(
         name,
         parameters={"resistance": resistance, "tolerance": tolerance},
@@ -342,9 +376,10 @@ def create_resistor(name: str, resistance: float, tolerance: float = 0.05) -> Co
         description=f"{resistance}Ω 电阻器"
     )
 
-def create_capacitor(name: str, capacitance: float, voltage_rating: float = 50.0) -> ComponentInterface:
+def create_capacitor(name: str, capacitance: float, voltage_rating: float = 50.0,
+                     db_path: str = "components.db") -> ComponentInterface:
     """创建电容器"""
-    manager = ComponentManager()
+    manager = ComponentManager(db_path)
     return manager.create_component(
         name,
         parameters={"capacitance": capacitance},
@@ -352,12 +387,13 @@ def create_capacitor(name: str, capacitance: float, voltage_rating: float = 50.0
         description=f"{capacitance}F 电容器"
     )
 
-def create_flipflop(name: str, ff_type: str = "D") -> ComponentInterface:
+def create_flipflop(name: str, ff_type: str = "D", db_path: str = "components.db") -> ComponentInterface:
     """创建触发器"""
-    manager = ComponentManager()
+    manager = ComponentManager(db_path)
     return manager.create_component(name, "flipflop", flip_flop_type=ff_type)
 
-def create_counter(name: str, width: int = 8, count_up: bool = True) -> ComponentInterface:
+def create_counter(name: str, width: int = 8, count_up: bool = True,
+                   db_path: str = "components.db") -> ComponentInterface:
     """创建计数器"""
-    manager = ComponentManager()
+    manager = ComponentManager(db_path)
     return manager.create_component(name, "counter", width=width, count_up=count_up) 
\ No newline at end of file
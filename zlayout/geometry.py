@@ -16,6 +16,8 @@ except ImportError:
 class Point:
     """2D point with coordinates and utility methods."""
     
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float, y: float):
         self.x = float(x)
         self.y = float(y)
@@ -34,29 +36,44 @@ class Point:
     def __hash__(self) -> int:
         return hash((round(self.x, 10), round(self.y, 10)))
     
+    def distance_sq_to(self, other: 'Point') -> float:
+        """Calculate squared Euclidean distance to another point.
+        
+        Cheaper than distance_to() when only comparing distances.
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+    
     def distance_to(self, other: 'Point') -> float:
         """Calculate Euclidean distance to another point."""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        return math.sqrt(self.distance_sq_to(other))
     
-    def distance_to_line(self, line_start: 'Point', line_end: 'Point') -> float:
-        """Calculate distance from this point to a line segment."""
+    def distance_sq_to_line(self, line_start: 'Point', line_end: 'Point') -> float:
+        """Calculate squared distance from this point to a line segment."""
         # Vector from line_start to line_end
-        line_vec = Point(line_end.x - line_start.x, line_end.y - line_start.y)
-        line_length_sq = line_vec.x**2 + line_vec.y**2
+        line_x = line_end.x - line_start.x
+        line_y = line_end.y - line_start.y
+        line_length_sq = line_x * line_x + line_y * line_y
         
         if line_length_sq < 1e-10:  # Degenerate line
-            return self.distance_to(line_start)
+            return self.distance_sq_to(line_start)
         
         # Vector from line_start to this point
-        point_vec = Point(self.x - line_start.x, self.y - line_start.y)
+        point_x = self.x - line_start.x
+        point_y = self.y - line_start.y
         
         # Project point onto line
-        t = max(0, min(1, (point_vec.x * line_vec.x + point_vec.y * line_vec.y) / line_length_sq))
-        
-        # Find closest point on line segment
-        closest = Point(line_start.x + t * line_vec.x, line_start.y + t * line_vec.y)
+        t = max(0, min(1, (point_x * line_x + point_y * line_y) / line_length_sq))
         
-        return self.distance_to(closest)
+        # Offset from the closest point on the line segment
+        dx = point_x - t * line_x
+        dy = point_y - t * line_y
+        return dx * dx + dy * dy
+    
+    def distance_to_line(self, line_start: 'Point', line_end: 'Point') -> float:
+        """Calculate distance from this point to a line segment."""
+        return math.sqrt(self.distance_sq_to_line(line_start, line_end))
     
     def to_numpy(self):
         """Convert to numpy array (if numpy is available)."""
@@ -69,6 +86,11 @@ class Point:
 class Rectangle:
     """Axis-aligned rectangle for bounding boxes and simple components."""
     
+    __slots__ = ('x', 'y', 'width', 'height')
+    
+    # Unit square corners in to_polygon() vertex order, scaled and translated per call
+    _UNIT_RECT = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]) if HAS_NUMPY else None
+    
     def __init__(self, x: float, y: float, width: float, height: float):
         self.x = float(x)
         self.y = float(y)
@@ -100,16 +122,21 @@ class Rectangle:
     
     def contains_point(self, point: Point) -> bool:
         """Check if point is inside rectangle."""
-        return (self.left <= point.x <= self.right and 
-                self.bottom <= point.y <= self.top)
+        x, y = point.x, point.y
+        return (self.x <= x <= self.x + self.width and
+                self.y <= y <= self.y + self.height)
     
     def intersects(self, other: 'Rectangle') -> bool:
-        """Check if this rectangle intersects with another."""
-        return not (self.right < other.left or other.right < self.left or
-                   self.top < other.bottom or other.top < self.bottom)
+        """Check if this rectangle intersects with another (touching counts)."""
+        # Edges computed inline: the left/right/top/bottom properties cost a call each
+        return not (self.x + self.width < other.x or other.x + other.width < self.x or
+                    self.y + self.height < other.y or other.y + other.height < self.y)
     
     def to_polygon(self) -> 'Polygon':
         """Convert rectangle to polygon."""
+        if HAS_NUMPY:
+            return Polygon.from_array(self._UNIT_RECT * (self.width, self.height) + (self.x, self.y))
+        
         vertices = [
             Point(self.left, self.bottom),
             Point(self.right, self.bottom),
@@ -120,15 +147,81 @@ class Rectangle:
 
 
 class Polygon:
-    """Polygon class supporting both convex and concave polygons."""
+    """Polygon class supporting both convex and concave polygons.
+    
+    When numpy is available the vertex coordinates are stored in a single
+    (N, 2) float64 array; Point objects for ``vertices`` are created lazily.
+    ``vertices`` is an immutable tuple; assign a new sequence to replace them.
+    """
+    
+    __slots__ = ('_xy', '_vertices')
+    
+    def __init__(self, vertices: Union[List[Point], 'np.ndarray']):
+        self.vertices = vertices
+    
+    def _set_xy(self, xy: 'np.ndarray') -> None:
+        """Adopt an (N, 2) float64 coordinate array as vertex storage."""
+        if xy.ndim != 2 or xy.shape[1] != 2:
+            raise ValueError("Polygon coordinates must have shape (N, 2)")
+        if len(xy) < 3:
+            raise ValueError("Polygon must have at least 3 vertices")
+        self._xy = xy
+        self._vertices = None
     
-    def __init__(self, vertices: List[Point]):
+    @classmethod
+    def from_array(cls, coords) -> 'Polygon':
+        """Create a polygon from an (N, 2) array or sequence of (x, y) pairs.
+        
+        A float64 ndarray is adopted without copying, so it should not be
+        modified afterwards.
+        """
+        if not HAS_NUMPY:
+            return cls([Point(x, y) for x, y in coords])
+        
+        polygon = cls.__new__(cls)
+        polygon._set_xy(np.asarray(coords, dtype=np.float64))
+        return polygon
+    
+    @property
+    def vertices(self) -> Tuple[Point, ...]:
+        """Polygon vertices as Point objects."""
+        if self._vertices is None:
+            self._vertices = tuple(Point(x, y) for x, y in self._xy.tolist())
+        return self._vertices
+    
+    @vertices.setter
+    def vertices(self, vertices: Union[List[Point], 'np.ndarray']) -> None:
         if len(vertices) < 3:
             raise ValueError("Polygon must have at least 3 vertices")
-        self.vertices = vertices.copy()
+        
+        if HAS_NUMPY:
+            if isinstance(vertices, np.ndarray):
+                xy = np.array(vertices, dtype=np.float64)
+            else:
+                xy = np.array([(v.x, v.y) for v in vertices], dtype=np.float64)
+            self._set_xy(xy)
+        else:
+            self._xy = None
+            self._vertices = tuple(vertices)
+    
+    def __len__(self) -> int:
+        return len(self._xy) if self._xy is not None else len(self._vertices)
+    
+    def __iter__(self):
+        return iter(self.vertices)
     
     def __repr__(self) -> str:
-        return f"Polygon({len(self.vertices)} vertices)"
+        return f"Polygon({len(self)} vertices)"
+    
+    def to_numpy(self):
+        """Vertex coordinates as an (N, 2) array (if numpy is available).
+        
+        The returned array is the polygon's own storage and must not be modified.
+        """
+        if HAS_NUMPY:
+            return self._xy
+        else:
+            return [[v.x, v.y] for v in self._vertices]
     
     @property
     def edges(self) -> List[Tuple[Point, Point]]:
@@ -141,6 +234,11 @@ class Polygon:
     
     def bounding_box(self) -> Rectangle:
         """Calculate axis-aligned bounding box."""
+        if self._xy is not None:
+            min_x, min_y = self._xy.min(axis=0).tolist()
+            max_x, max_y = self._xy.max(axis=0).tolist()
+            return Rectangle(min_x, min_y, max_x - min_x, max_y - min_y)
+        
         if not self.vertices:
             raise ValueError("Cannot calculate bounding box of empty polygon")
         
@@ -153,9 +251,13 @@ class Polygon:
     
     def area(self) -> float:
         """Calculate polygon area using shoelace formula."""
-        if len(self.vertices) < 3:
+        if len(self) < 3:
             return 0.0
         
+        if self._xy is not None:
+            xs, ys = self._xy[:, 0], self._xy[:, 1]
+            return abs(float(np.dot(xs, np.roll(ys, -1)) - np.dot(np.roll(xs, -1), ys))) / 2.0
+        
         area = 0.0
         n = len(self.vertices)
         for i in range(n):
@@ -222,9 +324,8 @@ class Polygon:
     
     def _point_on_edge(self, point: Point, edge_start: Point, edge_end: Point) -> bool:
         """Check if a point lies on an edge."""
-        # Use distance to line segment
-        distance = point.distance_to_line(edge_start, edge_end)
-        return distance < 1e-10
+        # Use squared distance to line segment
+        return point.distance_sq_to_line(edge_start, edge_end) < 1e-20
     
     def get_sharp_angles(self, threshold_degrees: float = 30.0) -> List[int]:
         """Find vertices with sharp angles or boundary angles.
@@ -6,9 +6,16 @@
 
 from typing import Dict, List, Any, Optional, Set, Tuple
 from enum import Enum
-from dataclasses import dataclass
 import time
 
+# 可选numpy导入 - 没有numpy时状态转移表使用纯Python实现
+try:
+    import numpy as np
+    from ._kernels import run_transitions
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 class LogicState(Enum):
     """逻辑状态"""
     LOW = 0
@@ -22,12 +29,25 @@ class ClockEdge(Enum):
     FALLING = "falling"
     BOTH = "both"
 
-@dataclass
 class Signal:
     """信号定义"""
-    name: str
-    state: LogicState = LogicState.UNKNOWN
-    timestamp: float = 0.0
+    
+    __slots__ = ('name', 'state', 'timestamp')
+    
+    def __init__(self, name: str, state: LogicState = LogicState.UNKNOWN, timestamp: float = 0.0):
+        self.name = name
+        self.state = state
+        self.timestamp = timestamp
+    
+    def __repr__(self) -> str:
+        return f"Signal(name={self.name!r}, state={self.state}, timestamp={self.timestamp!r})"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.name, self.state, self.timestamp) == (other.name, other.state, other.timestamp)
+    
+    __hash__ = None
     
     def set_state(self, state: LogicState):
         """设置信号状态"""
@@ -37,6 +57,9 @@ class Signal:
 class StateMachine:
     """状态机基类"""
     
+    __slots__ = ('name', 'current_state', 'states', 'transitions', 'state_history',
+                 'input_signals', 'output_signals', '_transition_table')
+    
     def __init__(self, name: str):
         self.name = name
         self.current_state = "IDLE"
@@ -45,16 +68,95 @@ class StateMachine:
         self.state_history: List[Tuple[str, float]] = []
         self.input_signals: Dict[str, Signal] = {}
         self.output_signals: Dict[str, Signal] = {}
+        self._transition_table = None
     
     def add_state(self, state: str):
         """添加状态"""
         self.states.add(state)
+        self._transition_table = None
     
     def add_transition(self, from_state: str, to_state: str, condition: str):
         """添加状态转移"""
         if from_state not in self.transitions:
             self.transitions[from_state] = {}
         self.transitions[from_state][condition] = to_state
+        self._transition_table = None
+    
+    def _get_transition_table(self):
+        """获取状态转移表 (状态索引 x 事件索引 -> 下一状态索引)，按需构建"""
+        if self._transition_table is None:
+            state_names = tuple(sorted(self.states))
+            state_index = {state: i for i, state in enumerate(state_names)}
+            event_names = sorted({condition for conditions in self.transitions.values()
+                                  for condition in conditions})
+            event_codes = {event: i for i, event in enumerate(event_names)}
+            
+            # 未定义的转移保持当前状态
+            table = [[i] * len(event_names) for i in range(len(state_names))]
+            for from_state, conditions in self.transitions.items():
+                if from_state not in state_index:
+                    continue
+                for condition, to_state in conditions.items():
+                    if to_state in state_index:
+                        table[state_index[from_state]][event_codes[condition]] = state_index[to_state]
+            
+            if HAS_NUMPY:
+                table = np.array(table, dtype=np.int16).reshape(len(state_names), len(event_names))
+            self._transition_table = (state_names, state_index, event_codes, table)
+        return self._transition_table
+    
+    @property
+    def state_names(self) -> Tuple[str, ...]:
+        """run_sequence() 返回的状态索引对应的状态名"""
+        return self._get_transition_table()[0]
+    
+    @property
+    def event_codes(self) -> Dict[str, int]:
+        """转移条件名 -> run_sequence() 使用的事件编号"""
+        return dict(self._get_transition_table()[2])
+    
+    def run_sequence(self, events):
+        """批量执行事件序列，返回每个事件之后的状态索引
+        
+        事件可以是转移条件名或 event_codes 中的编号；当前状态没有对应
+        转移的事件不改变状态。不会逐次打印状态转移。
+        """
+        state_names, state_index, event_codes, table = self._get_transition_table()
+        
+        if HAS_NUMPY and isinstance(events, np.ndarray):
+            codes = events.astype(np.int16)
+        else:
+            codes = []
+            for event in events:
+                if isinstance(event, str):
+                    if event not in event_codes:
+                        raise ValueError(f"Unknown event: {event}")
+                    codes.append(event_codes[event])
+                else:
+                    codes.append(int(event))
+        
+        if len(codes) and (min(codes) < 0 or max(codes) >= len(event_codes)):
+            raise ValueError("Event code out of range")
+        
+        start = state_index[self.current_state]
+        if HAS_NUMPY:
+            path = run_transitions(table, start, np.asarray(codes, dtype=np.int16))
+            changed = np.flatnonzero(np.diff(path, prepend=start)).tolist()
+            visited = path[changed].tolist()
+        else:
+            path = []
+            state = start
+            for code in codes:
+                state = table[state][code]
+                path.append(state)
+            visited = [s for prev, s in zip([start] + path, path) if s != prev]
+        
+        # 记录状态历史
+        now = time.time()
+        self.state_history.extend((state_names[s], now) for s in visited)
+        if len(path):
+            self.current_state = state_names[int(path[-1])]
+        return path
     
     def add_input(self, signal_name: str):
         """添加输入信号"""
@@ -83,6 +185,9 @@ class StateMachine:
 class SequentialLogic:
     """时序逻辑电路基类"""
     
+    __slots__ = ('name', 'clock_signal', 'reset_signal', 'enable_signal', 'inputs', 'outputs',
+                 'internal_state', 'clock_edge', 'setup_time', 'hold_time', 'propagation_delay')
+    
     def __init__(self, name: str):
         self.name = name
         self.clock_signal = Signal("clock")
@@ -96,6 +201,17 @@ class SequentialLogic:
         self.hold_time = 0.1   # ns
         self.propagation_delay = 0.5  # ns
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """按 __slots__ 收集状态，供子类在序列化时增删字段"""
+        return {slot: getattr(self, slot)
+                for cls in type(self).__mro__
+                for slot in cls.__dict__.get('__slots__', ())
+                if hasattr(self, slot)}
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+    
     def add_input(self, signal_name: str):
         """添加输入信号"""
         self.inputs[signal_name] = Signal(signal_name)
@@ -120,9 +236,20 @@ class SequentialLogic:
 class FlipFlop(SequentialLogic):
     """触发器"""
     
+    __slots__ = ('ff_type', '_edge_handler')
+    
+    # 触发器类型 -> 边沿处理方法名
+    _EDGE_HANDLERS = {
+        "D": "_handle_d_ff",
+        "JK": "_handle_jk_ff",
+        "SR": "_handle_sr_ff",
+    }
+    
     def __init__(self, name: str, ff_type: str = "D"):
         super().__init__(name)
         self.ff_type = ff_type
+        # 类型在构造后固定，预先绑定对应的处理方法，避免每个时钟边沿重复分派
+        self._edge_handler = getattr(self, self._EDGE_HANDLERS.get(ff_type, "_hold"))
         
         if ff_type == "D":
             self.add_input("D")
@@ -141,6 +268,16 @@ class FlipFlop(SequentialLogic):
         
         self.internal_state["Q"] = LogicState.LOW
     
+    def __getstate__(self) -> Dict[str, Any]:
+        # 绑定方法不写入状态，恢复时按触发器类型重新绑定
+        state = super().__getstate__()
+        state.pop('_edge_handler', None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        super().__setstate__(state)
+        self._edge_handler = getattr(self, self._EDGE_HANDLERS.get(self.ff_type, "_hold"))
+    
     def on_clock_edge(self):
         """时钟边沿触发"""
         if self.reset_signal.state == LogicState.HIGH:
@@ -150,12 +287,11 @@ class FlipFlop(SequentialLogic):
         if self.enable_signal.state == LogicState.LOW:
             return
         
-        if self.ff_type == "D":
-            self._handle_d_ff()
-        elif self.ff_type == "JK":
-            self._handle_jk_ff()
-        elif self.ff_type == "SR":
-            self._handle_sr_ff()
+        self._edge_handler()
+    
+    def _hold(self):
+        """未知触发器类型：保持状态"""
+        pass
     
     def _handle_d_ff(self):
         """处理D触发器"""
@@ -223,12 +359,14 @@ class FlipFlop(SequentialLogic):
 class Counter(SequentialLogic):
     """计数器"""
     
+    __slots__ = ('width', 'count_up', 'max_count', 'count')
+    
     def __init__(self, name: str, width: int = 8, count_up: bool = True):
         super().__init__(name)
         self.width = width
         self.count_up = count_up
         self.max_count = (1 << width) - 1
-        self.internal_state["count"] = 0
+        self.count = 0
         
         # 添加输出信号
         for i in range(width):
@@ -237,6 +375,15 @@ class Counter(SequentialLogic):
         self.add_output("carry")
         self.add_output("zero")
     
+    @property
+    def internal_state(self) -> Dict[str, Any]:
+        """计数值以属性 count 保存，这里返回其快照以兼容通用接口"""
+        return {"count": self.count}
+    
+    @internal_state.setter
+    def internal_state(self, state: Dict[str, Any]):
+        self.count = state.get("count", 0)
+    
     def on_clock_edge(self):
         """时钟边沿触发"""
         if self.reset_signal.state == LogicState.HIGH:
@@ -246,16 +393,45 @@ class Counter(SequentialLogic):
         if self.enable_signal.state == LogicState.LOW:
             return
         
-        current_count = self.internal_state["count"]
+        current_count = self.count
         
+        # max_count 是全1掩码，按位与即可完成回绕（负数同样适用）
         if self.count_up:
-            new_count = (current_count + 1) % (self.max_count + 1)
+            new_count = (current_count + 1) & self.max_count
             carry = (current_count == self.max_count)
         else:
-            new_count = (current_count - 1) % (self.max_count + 1)
+            new_count = (current_count - 1) & self.max_count
             carry = (current_count == 0)
         
-        self.internal_state["count"] = new_count
+        self._set_count(new_count, carry)
+    
+    def advance(self, cycles: int):
+        """一次推进多个时钟周期，结果与连续调用 on_clock_edge() 相同
+        
+        输入信号在这些周期内保持不变，因此计数只需一次取模运算。
+        """
+        if cycles <= 0:
+            return
+        
+        if self.reset_signal.state == LogicState.HIGH:
+            self.reset()
+            return
+        
+        if self.enable_signal.state == LogicState.LOW:
+            return
+        
+        step = 1 if self.count_up else -1
+        new_count = (self.count + step * cycles) & self.max_count
+        
+        # 进位只取决于最后一个时钟周期之前的计数值
+        last_count = (new_count - step) & self.max_count
+        carry = (last_count == self.max_count) if self.count_up else (last_count == 0)
+        
+        self._set_count(new_count, carry)
+    
+    def _set_count(self, new_count: int, carry: bool):
+        """更新计数值和输出信号"""
+        self.count = new_count
         
         # 更新输出
         for i in range(self.width):
@@ -269,7 +445,7 @@ class Counter(SequentialLogic):
     
     def reset(self):
         """复位"""
-        self.internal_state["count"] = 0
+        self.count = 0
         for i in range(self.width):
             self.outputs[f"Q{i}"].set_state(LogicState.LOW)
         self.outputs["carry"].set_state(LogicState.LOW)
@@ -278,6 +454,8 @@ class Counter(SequentialLogic):
 class ProcessorFSM(StateMachine):
     """处理器有限状态机"""
     
+    __slots__ = ()
+    
     def __init__(self, name: str):
         super().__init__(name)
         
@@ -351,6 +529,12 @@ class ProcessorFSM(StateMachine):
             self.output_signals["writeback_enable"].set_state(LogicState.HIGH)
         elif self.current_state == "HALT":
             self.output_signals["halt"].set_state(LogicState.HIGH)
+    
+    def run_sequence(self, events):
+        """批量执行事件序列并更新输出信号"""
+        path = super().run_sequence(events)
+        self.update_outputs()
+        return path
 
 # 使用示例
 if __name__ == "__main__":
@@ -375,7 +559,7 @@ if __name__ == "__main__":
     print("计数器状态:")
     for i in range(6):
         counter.on_clock_edge()
-        count_value = counter.internal_state["count"]
+        count_value = counter.count
         print(f"时钟{i+1}: 计数值={count_value}, 零标志={counter.outputs['zero'].state}")
     
     # 创建处理器状态机
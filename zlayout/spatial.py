@@ -2,9 +2,62 @@
 Spatial indexing structures for efficient geometric queries.
 """
 
-from typing import List, Set, Optional, Union, Tuple, Any
+import sys
+from typing import List, Set, Optional, Union, Tuple, Any, Dict
 from .geometry import Point, Rectangle, Polygon
 
+# Optional numpy import - fallback to built-in types if not available
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def _part1by1(v: int) -> int:
+    """Spread the low 16 bits of v so that there is a zero bit between each."""
+    v &= 0x0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+def morton_order(bboxes: List[Rectangle], world_bounds: Rectangle) -> List[int]:
+    """Return the indices of bboxes sorted along a Z-order (Morton) curve.
+    
+    Bounding box centers are quantized to a 16-bit grid over world_bounds and
+    their bits interleaved into 32-bit codes; equal codes keep input order.
+    """
+    n = len(bboxes)
+    if n < 2:
+        return list(range(n))
+    
+    scale_x = 65535.0 / world_bounds.width if world_bounds.width > 0 else 0.0
+    scale_y = 65535.0 / world_bounds.height if world_bounds.height > 0 else 0.0
+    
+    if HAS_NUMPY:
+        cx = np.fromiter((b.x + b.width / 2 for b in bboxes), dtype=np.float64, count=n)
+        cy = np.fromiter((b.y + b.height / 2 for b in bboxes), dtype=np.float64, count=n)
+        codes = np.zeros(n, dtype=np.uint32)
+        for shift, coords, origin, scale in ((0, cx, world_bounds.x, scale_x),
+                                             (1, cy, world_bounds.y, scale_y)):
+            v = np.clip((coords - origin) * scale, 0, 65535).astype(np.uint32)
+            v = (v | (v << 8)) & 0x00FF00FF
+            v = (v | (v << 4)) & 0x0F0F0F0F
+            v = (v | (v << 2)) & 0x33333333
+            v = (v | (v << 1)) & 0x55555555
+            codes |= v << shift
+        return np.argsort(codes, kind='stable').tolist()
+    
+    codes = []
+    for b in bboxes:
+        qx = int(min(max((b.x + b.width / 2 - world_bounds.x) * scale_x, 0), 65535))
+        qy = int(min(max((b.y + b.height / 2 - world_bounds.y) * scale_y, 0), 65535))
+        codes.append(_part1by1(qx) | (_part1by1(qy) << 1))
+    return sorted(range(n), key=codes.__getitem__)
+
 
 class QuadTreeNode:
     """A node in the quadtree structure."""
@@ -49,11 +102,11 @@ class QuadTreeNode:
         if not self.divided and self.max_depth > 0:
             self.subdivide()
         
-        # Try to insert into children
+        # Try to insert into the child that fully contains the object
         if self.divided:
             for child in self.children:
-                if child.insert(obj, bbox):
-                    return True
+                if child._contains_bbox(bbox):
+                    return child.insert(obj, bbox)
             # If no child could contain it, store it at this level
             self.objects.append((obj, bbox))
             return True
@@ -62,25 +115,96 @@ class QuadTreeNode:
             self.objects.append((obj, bbox))
             return True
     
+    def insert_many(self, items: List[Tuple[Any, Rectangle]]) -> int:
+        """Insert several (object, bbox) pairs, returning how many were stored.
+        
+        Produces the same tree as calling insert() for each pair in order, but
+        partitions the batch once per node instead of descending from the root
+        for every object.
+        """
+        items = [item for item in items if self._intersects_boundary(item[1])]
+        if not items:
+            return 0
+        
+        start = 0
+        if not self.divided:
+            # Fill remaining capacity first, exactly like sequential inserts
+            start = min(max(self.capacity - len(self.objects), 0), len(items))
+            self.objects.extend(items[:start])
+            if start == len(items):
+                return len(items)
+            if self.max_depth > 0:
+                self.subdivide()
+        
+        if self.divided:
+            buckets: List[List[Tuple[Any, Rectangle]]] = [[] for _ in self.children]
+            for item in items[start:]:
+                for bucket, child in zip(buckets, self.children):
+                    if child._contains_bbox(item[1]):
+                        bucket.append(item)
+                        break
+                else:
+                    # If no child could contain it, store it at this level
+                    self.objects.append(item)
+            
+            for child, bucket in zip(self.children, buckets):
+                if bucket:
+                    child.insert_many(bucket)
+        else:
+            # No more subdivisions possible, store here
+            self.objects.extend(items[start:])
+        
+        return len(items)
+    
     def query_range(self, range_bbox: Rectangle) -> List[Any]:
         """Query all objects that intersect with the given range."""
         result = []
+        left, bottom = range_bbox.x, range_bbox.y
+        right, top = left + range_bbox.width, bottom + range_bbox.height
         
-        # Check if this node intersects with query range
-        if not self.boundary.intersects(range_bbox):
-            return result
+        # Depth-first in the same order as a recursive descent; the range edges
+        # are compared inline instead of through Rectangle.intersects()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            boundary = node.boundary
+            if (boundary.x > right or boundary.x + boundary.width < left or
+                    boundary.y > top or boundary.y + boundary.height < bottom):
+                continue
+            
+            for obj, bbox in node.objects:
+                x, y = bbox.x, bbox.y
+                if x <= right and left <= x + bbox.width and y <= top and bottom <= y + bbox.height:
+                    result.append(obj)
+            
+            if node.divided:
+                stack.extend(reversed(node.children))
         
-        # Check objects in this node
-        for obj, bbox in self.objects:
-            if bbox.intersects(range_bbox):
-                result.append(obj)
+        return result
+    
+    def count_range(self, range_bbox: Rectangle) -> int:
+        """Count objects intersecting the given range without collecting them."""
+        count = 0
+        left, bottom = range_bbox.x, range_bbox.y
+        right, top = left + range_bbox.width, bottom + range_bbox.height
         
-        # Recursively check children
-        if self.divided:
-            for child in self.children:
-                result.extend(child.query_range(range_bbox))
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            boundary = node.boundary
+            if (boundary.x > right or boundary.x + boundary.width < left or
+                    boundary.y > top or boundary.y + boundary.height < bottom):
+                continue
+            
+            for _, bbox in node.objects:
+                x, y = bbox.x, bbox.y
+                if x <= right and left <= x + bbox.width and y <= top and bottom <= y + bbox.height:
+                    count += 1
+            
+            if node.divided:
+                stack.extend(node.children)
         
-        return result
+        return count
     
     def query_point(self, point: Point) -> List[Any]:
         """Query all objects that contain the given point."""
@@ -106,6 +230,12 @@ class QuadTreeNode:
         """Check if bounding box intersects with this node's boundary."""
         return self.boundary.intersects(bbox)
     
+    def _contains_bbox(self, bbox: Rectangle) -> bool:
+        """Check if bounding box lies entirely within this node's boundary."""
+        boundary = self.boundary
+        return (boundary.x <= bbox.x and bbox.x + bbox.width <= boundary.x + boundary.width and
+                boundary.y <= bbox.y and bbox.y + bbox.height <= boundary.y + boundary.height)
+    
     def get_all_objects(self) -> List[Any]:
         """Get all objects in this subtree."""
         result = [obj for obj, _ in self.objects]
@@ -131,38 +261,85 @@ class QuadTree:
     def __init__(self, boundary: Rectangle, capacity: int = 10, max_depth: int = 8):
         self.root = QuadTreeNode(boundary, capacity, max_depth)
         self.object_count = 0
+        # Generation counter, bumped whenever the stored object set changes
+        self._gen = 0
+        self._intersect_cache: Optional[List[Tuple[Any, Any]]] = None
+        self._intersect_cache_gen = -1
     
-    def insert(self, obj: Any, bbox: Optional[Rectangle] = None) -> bool:
-        """Insert an object. If bbox is not provided, try to get it from the object."""
-        if bbox is None:
-            if hasattr(obj, 'bounding_box'):
-                bbox = obj.bounding_box()
-            elif hasattr(obj, 'boundary'):
-                bbox = obj.boundary
-            elif isinstance(obj, Rectangle):
-                bbox = obj
-            else:
-                raise ValueError("Cannot determine bounding box for object")
+    @staticmethod
+    def _bbox_of(obj: Any) -> Rectangle:
+        """Determine the bounding box of an object."""
+        if hasattr(obj, 'bounding_box'):
+            bbox = obj.bounding_box()
+        elif hasattr(obj, 'boundary'):
+            bbox = obj.boundary
+        elif isinstance(obj, Rectangle):
+            bbox = obj
+        else:
+            raise ValueError("Cannot determine bounding box for object")
         
         # bbox should now be guaranteed to be a Rectangle
         if bbox is None:
             raise ValueError("Could not determine bounding box")
+        return bbox
+    
+    def insert(self, obj: Any, bbox: Optional[Rectangle] = None) -> bool:
+        """Insert an object. If bbox is not provided, try to get it from the object."""
+        if bbox is None:
+            bbox = self._bbox_of(obj)
             
         success = self.root.insert(obj, bbox)
         if success:
             self.object_count += 1
+            self._gen += 1
         return success
     
+    def insert_many(self, objects: List[Any], bboxes: Optional[List[Rectangle]] = None) -> int:
+        """Insert several objects in one pass, returning how many were stored.
+        
+        Objects are inserted in the given order; use morton_order() beforehand
+        to improve locality for large batches.
+        """
+        if bboxes is None:
+            bboxes = [self._bbox_of(obj) for obj in objects]
+        elif len(bboxes) != len(objects):
+            raise ValueError("objects and bboxes must have the same length")
+        
+        inserted = self.root.insert_many(list(zip(objects, bboxes)))
+        if inserted:
+            self.object_count += inserted
+            self._gen += 1
+        return inserted
+    
     def query_range(self, range_bbox: Rectangle) -> List[Any]:
         """Find all objects that intersect with the given range."""
         return self.root.query_range(range_bbox)
     
+    def count_range(self, range_bbox: Rectangle) -> int:
+        """Count objects that intersect with the given range."""
+        return self.root.count_range(range_bbox)
+    
     def query_point(self, point: Point) -> List[Any]:
         """Find all objects that contain the given point."""
         return self.root.query_point(point)
     
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever objects are inserted or cleared."""
+        return self._gen
+    
     def find_intersections(self) -> List[Tuple[Any, Any]]:
-        """Find all pairs of objects that potentially intersect."""
+        """Find all pairs of objects that potentially intersect.
+        
+        The result is cached until the tree is next modified.
+        """
+        if self._intersect_cache_gen != self._gen:
+            self._intersect_cache = self._find_intersections()
+            self._intersect_cache_gen = self._gen
+        return list(self._intersect_cache)
+    
+    def _find_intersections(self) -> List[Tuple[Any, Any]]:
+        """Scan the tree for all potentially intersecting pairs."""
         intersections = []
         all_objects = [(obj, bbox) for obj, bbox in self._get_all_object_bbox_pairs()]
         
@@ -215,6 +392,30 @@ class QuadTree:
         """Get total number of objects in the tree."""
         return self.object_count
     
+    def stats(self) -> Dict[str, int]:
+        """Structural statistics from one walk over the tree.
+        
+        Returns the deepest node level ('depth', root is 0), 'node_count',
+        'object_count' and an estimate of the tree's own memory in 'bytes'
+        (nodes, boundaries and bucket lists, not the stored objects).
+        """
+        depth = node_count = object_count = size = 0
+        stack = [(self.root, 0)]
+        while stack:
+            node, level = stack.pop()
+            depth = max(depth, level)
+            node_count += 1
+            object_count += len(node.objects)
+            attrs = getattr(node, '__dict__', None)
+            size += (sys.getsizeof(node) +
+                     (sys.getsizeof(attrs) if attrs is not None else 0) +
+                     sys.getsizeof(node.boundary) + sys.getsizeof(node.children) +
+                     sys.getsizeof(node.objects))
+            stack.extend((child, level + 1) for child in node.children)
+        
+        return {'depth': depth, 'node_count': node_count,
+                'object_count': object_count, 'bytes': size}
+    
     def clear(self) -> None:
         """Remove all objects from the tree."""
         boundary = self.root.boundary
@@ -222,6 +423,7 @@ class QuadTree:
         max_depth = self.root.max_depth
         self.root = QuadTreeNode(boundary, capacity, max_depth)
         self.object_count = 0
+        self._gen += 1
 
 
 class SpatialIndex:
@@ -230,14 +432,28 @@ class SpatialIndex:
     def __init__(self, world_bounds: Rectangle, capacity: int = 10, max_depth: int = 8):
         self.quadtree = QuadTree(world_bounds, capacity, max_depth)
         self.objects = {}  # object_id -> object mapping
+        self._ids = {}  # id(object) -> object_id reverse mapping
         self._next_id = 0
+        # Bumped on removal, which does not touch the quadtree
+        self._gen = 0
+        self._edge_pairs_cache: Optional[List[Tuple[int, int]]] = None
+        self._edge_pairs_cache_key: Optional[Tuple[int, int]] = None
+    
+    def _register(self, obj_id: int, obj: Any) -> None:
+        """Record an object under its ID in both mappings."""
+        self.objects[obj_id] = obj
+        self._ids.setdefault(id(obj), obj_id)
+    
+    def _id_of(self, obj: Any) -> Optional[int]:
+        """Look up the ID of a stored object, or None if it was removed."""
+        return self._ids.get(id(obj))
     
     def add_polygon(self, polygon: Polygon) -> int:
         """Add a polygon to the spatial index."""
         obj_id = self._next_id
         self._next_id += 1
         
-        self.objects[obj_id] = polygon
+        self._register(obj_id, polygon)
         self.quadtree.insert(polygon)
         return obj_id
     
@@ -246,21 +462,57 @@ class SpatialIndex:
         obj_id = self._next_id
         self._next_id += 1
         
-        self.objects[obj_id] = rectangle
+        self._register(obj_id, rectangle)
         self.quadtree.insert(rectangle)
         return obj_id
     
+    def add_objects(self, objects: List[Union[Polygon, Rectangle]]) -> List[int]:
+        """Add several objects at once, returning their IDs in input order.
+        
+        The quadtree is built from the batch in Morton order rather than by
+        one root-to-leaf descent per object.
+        """
+        objects = list(objects)
+        obj_ids = list(range(self._next_id, self._next_id + len(objects)))
+        self._next_id += len(objects)
+        for obj_id, obj in zip(obj_ids, objects):
+            self._register(obj_id, obj)
+        
+        bboxes = [QuadTree._bbox_of(obj) for obj in objects]
+        order = morton_order(bboxes, self.quadtree.root.boundary)
+        self.quadtree.insert_many([objects[i] for i in order], [bboxes[i] for i in order])
+        return obj_ids
+    
     def remove_object(self, obj_id: int) -> bool:
         """Remove an object by ID. Note: QuadTree doesn't support efficient removal."""
         if obj_id in self.objects:
-            del self.objects[obj_id]
+            obj = self.objects.pop(obj_id)
+            if self._ids.get(id(obj)) == obj_id:
+                del self._ids[id(obj)]
+                # The same object may still be registered under another ID
+                for oid, stored_obj in self.objects.items():
+                    if stored_obj is obj:
+                        self._ids[id(obj)] = oid
+                        break
             # For efficient removal, we'd need to rebuild the tree
             # For now, just mark as removed
+            self._gen += 1
             return True
         return False
     
     def find_intersecting_edges(self) -> List[Tuple[int, int]]:
-        """Find all pairs of polygons with potentially intersecting edges."""
+        """Find all pairs of polygons with potentially intersecting edges.
+        
+        The result is cached until objects are next added or removed.
+        """
+        key = (self.quadtree.generation, self._gen)
+        if self._edge_pairs_cache_key != key:
+            self._edge_pairs_cache = self._find_intersecting_edges()
+            self._edge_pairs_cache_key = key
+        return list(self._edge_pairs_cache)
+    
+    def _find_intersecting_edges(self) -> List[Tuple[int, int]]:
+        """Scan the quadtree for polygon pairs with overlapping bounding boxes."""
         intersections = []
         all_polygons = [(obj_id, obj) for obj_id, obj in self.objects.items() 
                        if isinstance(obj, Polygon)]
@@ -271,13 +523,7 @@ class SpatialIndex:
             
             for candidate in candidates:
                 if isinstance(candidate, Polygon):
-                    # Find the ID of the candidate
-                    id2 = None
-                    for oid, obj in self.objects.items():
-                        if obj is candidate:
-                            id2 = oid
-                            break
-                    
+                    id2 = self._id_of(candidate)
                     if id2 is not None and id1 < id2:  # Avoid duplicates
                         intersections.append((id1, id2))
         
@@ -294,10 +540,9 @@ class SpatialIndex:
         # Convert objects back to IDs
         nearby_ids = []
         for nearby_obj in nearby:
-            for oid, stored_obj in self.objects.items():
-                if stored_obj is nearby_obj:
-                    nearby_ids.append(oid)
-                    break
+            oid = self._id_of(nearby_obj)
+            if oid is not None:
+                nearby_ids.append(oid)
         
         return nearby_ids
     
@@ -308,9 +553,8 @@ class SpatialIndex:
         # Convert objects back to IDs
         object_ids = []
         for obj in objects_in_region:
-            for oid, stored_obj in self.objects.items():
-                if stored_obj is obj:
-                    object_ids.append(oid)
-                    break
+            oid = self._id_of(obj)
+            if oid is not None:
+                object_ids.append(oid)
         
         return object_ids
\ No newline at end of file